@@ -0,0 +1,43 @@
+from fastapi import HTTPException, Request
+from fastapi.routing import APIRoute
+from typing import Callable
+import zlib
+
+
+MAX_DECOMPRESSED_BODY = 1024 * 1024  # 1MB, far above any JSON body this API accepts
+
+
+def _gunzip(body: bytes) -> bytes:
+    """Decompress a gzip request body, refusing anything that inflates past MAX_DECOMPRESSED_BODY"""
+    decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    try:
+        data = decompressor.decompress(body, MAX_DECOMPRESSED_BODY)
+    except zlib.error:
+        raise HTTPException(status_code=400, detail="Invalid gzip request body")
+    if decompressor.unconsumed_tail:
+        raise HTTPException(status_code=413, detail="Decompressed request body exceeds 1MB limit")
+    return data
+
+
+class GzipRequest(Request):
+    """Request whose body is transparently decompressed when sent with Content-Encoding: gzip"""
+
+    async def body(self) -> bytes:
+        if not hasattr(self, "_body"):
+            body = await super().body()
+            if "gzip" in self.headers.getlist("content-encoding"):
+                body = _gunzip(body)
+            self._body = body
+        return self._body
+
+
+class GzipRoute(APIRoute):
+    """Route class that hands endpoints a GzipRequest, so JSON bodies may be gzip-encoded"""
+
+    def get_route_handler(self) -> Callable:
+        route_handler = super().get_route_handler()
+
+        async def gzip_route_handler(request: Request):
+            return await route_handler(GzipRequest(request.scope, request.receive))
+
+        return gzip_route_handler
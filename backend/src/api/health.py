@@ -1,9 +1,11 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Response
 from pydantic import BaseModel
 from typing import Dict, Any
-from datetime import datetime
 import time
 import os
+import orjson
+
+from ..utils.timestamps import now_iso
 
 router = APIRouter()
 
@@ -26,29 +28,39 @@ class HealthResponse(BaseModel):
     version: str
 
 
-@router.get("/health", response_model=HealthResponse)
+# Pre-serialized health payload; only last_check and uptime_seconds vary per request
+_LAST_CHECK_PLACEHOLDER = b'"__LAST_CHECK__"'
+_UPTIME_PLACEHOLDER = b'"uptime_seconds":0'
+
+# Check Gemini API (simplified - would make actual API call and rebuild this
+# payload when its status changes)
+_gemini_status = ServiceHealth(
+    status="available",  # Would check actual API
+    last_check=_LAST_CHECK_PLACEHOLDER.strip(b'"').decode(),
+    response_time_ms=50  # Would measure actual response time
+)
+
+_HEALTH_TEMPLATE = orjson.dumps(
+    HealthResponse(
+        status="healthy" if _gemini_status.status == "available" else "degraded",
+        services={
+            "gemini_api": _gemini_status
+        },
+        uptime_seconds=0,
+        version="0.1.0"
+    ).model_dump()
+)
+
+
+@router.get("/health", responses={200: {"model": HealthResponse}})
 async def health_check():
     """Check API service health and external service status"""
-    now = datetime.now()
     uptime = int(time.time() - startup_time)
     
-    # Check Gemini API (simplified - would make actual API call)
-    gemini_status = ServiceHealth(
-        status="available",  # Would check actual API
-        last_check=now.isoformat(),
-        response_time_ms=50  # Would measure actual response time
+    body = _HEALTH_TEMPLATE.replace(
+        _LAST_CHECK_PLACEHOLDER, orjson.dumps(now_iso())
+    ).replace(
+        _UPTIME_PLACEHOLDER, b'"uptime_seconds":%d' % uptime
     )
     
-    # Overall status
-    overall_status = "healthy"
-    if gemini_status.status != "available":
-        overall_status = "degraded"
-    
-    return HealthResponse(
-        status=overall_status,
-        services={
-            "gemini_api": gemini_status
-        },
-        uptime_seconds=uptime,
-        version="0.1.0"
-    )
\ No newline at end of file
+    return Response(content=body, media_type="application/json")
@@ -1,13 +1,15 @@
-from fastapi import FastAPI, HTTPException, Request
+from fastapi import FastAPI, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
 import logging
-from datetime import datetime
+import os
+import sys
 
 from ..services.session_manager import SessionManagerError, SessionNotFoundError, ConcurrencyLimitError
 from .sessions import router as sessions_router
 from .health import router as health_router
+from .responses import APIResponse
+from ..utils.timestamps import now_iso
 
 
 # Configure logging
@@ -17,6 +19,8 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+KEEP_ALIVE_SECONDS = 75  # Idle keep-alive window; uvicorn's 5s default drops the UI's pooled connections between clicks
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -33,6 +37,7 @@ app = FastAPI(
     title="ClinIPrompt Tutorial Assistant API",
     description="REST API for medical tutorial processing and podcast-style summary generation",
     version="0.1.0",
+    default_response_class=APIResponse,
     lifespan=lifespan
 )
 
@@ -50,13 +55,13 @@ app.add_middleware(
 @app.exception_handler(SessionNotFoundError)
 async def session_not_found_handler(request: Request, exc: SessionNotFoundError):
     """Handle session not found errors"""
-    return JSONResponse(
+    return APIResponse(
         status_code=404,
         content={
             "error": {
                 "code": "SESSION_NOT_FOUND",
                 "message": str(exc),
-                "timestamp": datetime.now().isoformat()
+                "timestamp": now_iso()
             }
         }
     )
@@ -65,13 +70,13 @@ async def session_not_found_handler(request: Request, exc: SessionNotFoundError)
 @app.exception_handler(ConcurrencyLimitError)  
 async def concurrency_limit_handler(request: Request, exc: ConcurrencyLimitError):
     """Handle concurrency limit errors"""
-    return JSONResponse(
+    return APIResponse(
         status_code=429,
         content={
             "error": {
                 "code": "CONCURRENCY_LIMIT_EXCEEDED",
                 "message": str(exc),
-                "timestamp": datetime.now().isoformat()
+                "timestamp": now_iso()
             }
         }
     )
@@ -80,13 +85,13 @@ async def concurrency_limit_handler(request: Request, exc: ConcurrencyLimitError
 @app.exception_handler(SessionManagerError)
 async def session_manager_error_handler(request: Request, exc: SessionManagerError):
     """Handle general session manager errors"""
-    return JSONResponse(
+    return APIResponse(
         status_code=500,
         content={
             "error": {
                 "code": "SESSION_MANAGER_ERROR", 
                 "message": str(exc),
-                "timestamp": datetime.now().isoformat()
+                "timestamp": now_iso()
             }
         }
     )
@@ -96,13 +101,13 @@ async def session_manager_error_handler(request: Request, exc: SessionManagerErr
 async def general_exception_handler(request: Request, exc: Exception):
     """Handle unexpected errors"""
     logger.error(f"Unexpected error: {str(exc)}", exc_info=True)
-    return JSONResponse(
+    return APIResponse(
         status_code=500,
         content={
             "error": {
                 "code": "INTERNAL_SERVER_ERROR",
                 "message": "An unexpected error occurred",
-                "timestamp": datetime.now().isoformat()
+                "timestamp": now_iso()
             }
         }
     )
@@ -113,13 +118,29 @@ app.include_router(sessions_router, prefix="/api/v1")
 app.include_router(health_router, prefix="/api/v1")
 
 
-# Root endpoint
+# Root endpoint (pre-serialized; only the timestamp varies per request)
+_ROOT_TEMPLATE = (
+    b'{"service":"ClinIPrompt Tutorial Assistant API","version":"0.1.0",'
+    b'"status":"running","timestamp":"%s"}'
+)
+
+
 @app.get("/")
 async def root():
     """Root endpoint"""
-    return {
-        "service": "ClinIPrompt Tutorial Assistant API",
-        "version": "0.1.0",
-        "status": "running",
-        "timestamp": datetime.now().isoformat()
-    }
\ No newline at end of file
+    return Response(content=_ROOT_TEMPLATE % now_iso().encode(), media_type="application/json")
+
+
+if __name__ == "__main__":
+    import uvicorn
+    
+    # Pin the C-implemented event loop and HTTP parser (both ship with uvicorn[standard])
+    uvicorn.run(
+        "src.api.main:app",
+        host=os.getenv("CLINIPROMPT_API_HOST", "0.0.0.0"),
+        port=int(os.getenv("CLINIPROMPT_API_PORT", "8001")),
+        reload=os.getenv("CLINIPROMPT_API_RELOAD", "false").lower() == "true",
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+        timeout_keep_alive=KEEP_ALIVE_SECONDS
+    )
\ No newline at end of file
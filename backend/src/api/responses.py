@@ -0,0 +1,42 @@
+from fastapi import Request, Response
+from fastapi.responses import ORJSONResponse
+from pathlib import Path
+from enum import Enum
+from typing import Any
+import hashlib
+import orjson
+
+
+def _orjson_default(obj: Any) -> Any:
+    """Serialize types orjson does not handle natively"""
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, Path):
+        return str(obj)
+    raise TypeError(f"Type is not JSON serializable: {type(obj).__name__}")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode API content to JSON bytes with the shared orjson settings"""
+    return orjson.dumps(
+        content,
+        default=_orjson_default,
+        option=orjson.OPT_NON_STR_KEYS
+    )
+
+
+class APIResponse(ORJSONResponse):
+    """JSON response rendered with orjson, bypassing FastAPI's jsonable_encoder"""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def conditional_response(request: Request, content: Any) -> Response:
+    """Render content with a weak ETag, answering 304 Not Modified when the client's copy is current"""
+    body = dumps(content)
+    etag = f'W/"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
@@ -1,20 +1,45 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File, Form
+from fastapi import APIRouter, HTTPException, Query, Request, UploadFile, File, Form
 from pydantic import BaseModel, validator
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, BinaryIO
 from datetime import datetime
+from pathlib import Path
+import asyncio
 import logging
+import os
 
-from ..services.session_manager import session_manager, SessionNotFoundError, ConcurrencyLimitError
+from ..services.session_manager import session_manager, SessionNotFoundError, ConcurrencyLimitError, StorageQuotaExceededError
 from ..models.tutorial_session import WorkflowState
 from ..models.audio_recording import AudioRecording
+from ..models.session_data import ProcessingStatusType
+from .responses import APIResponse, conditional_response
+from .compression import GzipRoute
 
 
 logger = logging.getLogger(__name__)
 
-router = APIRouter()
+router = APIRouter(route_class=GzipRoute)
 
+MAX_AUDIO_SIZE = 30 * 1024 * 1024  # 30MB
 
-# Request/Response models
+ALLOWED_VOICES = frozenset({"professional_female", "professional_male", "conversational_female", "conversational_male"})
+ALLOWED_STYLES = frozenset({"conversational", "technical", "basic"})
+ALLOWED_AUDIO_TYPES = frozenset({"audio/mp3", "audio/mpeg", "audio/wav", "audio/m4a", "audio/mp4", "audio/ogg", "application/octet-stream"})
+ALLOWED_AUDIO_EXTENSIONS = (".mp3", ".wav", ".m4a", ".mp4", ".ogg")
+
+PROCESSING_READY_STATES = frozenset({WorkflowState.AUDIO_UPLOADED, WorkflowState.CONTENT_ADDED})
+PROCESSING_TERMINAL_STATUSES = frozenset({ProcessingStatusType.COMPLETED, ProcessingStatusType.ERROR})
+MAX_STATUS_WAIT_SECONDS = 30  # Upper bound for ?wait= long-polling on /status
+STATE_VALUES = {state: state.value for state in WorkflowState}
+
+
+def _save_audio_upload(session_id: str, source: BinaryIO, filename: str) -> Path:
+    """Save an uploaded audio file into the session workspace (blocking)"""
+    session_manager.create_workspace(session_id)
+    return session_manager.save_large_file(session_id, source, "audio/original", filename)
+
+
+# Request/Response models (response models document the OpenAPI schema only;
+# routes build their payloads as plain dicts and serialize them with orjson)
 class UserPreferences(BaseModel):
     """User preferences model"""
     preferred_voice: Optional[str] = "professional_female"
@@ -23,16 +48,14 @@ class UserPreferences(BaseModel):
     
     @validator('preferred_voice')
     def validate_voice(cls, v):
-        allowed_voices = ["professional_female", "professional_male", "conversational_female", "conversational_male"]
-        if v not in allowed_voices:
-            raise ValueError(f"Invalid voice. Must be one of: {allowed_voices}")
+        if v not in ALLOWED_VOICES:
+            raise ValueError(f"Invalid voice. Must be one of: {sorted(ALLOWED_VOICES)}")
         return v
     
     @validator('summary_style')
     def validate_style(cls, v):
-        allowed_styles = ["conversational", "technical", "basic"]
-        if v not in allowed_styles:
-            raise ValueError(f"Invalid style. Must be one of: {allowed_styles}")
+        if v not in ALLOWED_STYLES:
+            raise ValueError(f"Invalid style. Must be one of: {sorted(ALLOWED_STYLES)}")
         return v
 
 
@@ -77,8 +100,8 @@ class SessionDetail(BaseModel):
     generated_summary: Optional[Dict[str, Any]] = None
 
 
-@router.post("/sessions", response_model=SessionResponse, status_code=201)
-async def create_session(request: CreateSessionRequest = CreateSessionRequest()):
+@router.post("/sessions", status_code=201, responses={201: {"model": SessionResponse}})
+async def create_session(http_request: Request, request: CreateSessionRequest = CreateSessionRequest()):
     """Create a new tutorial session"""
     try:
         # Convert preferences to dict
@@ -89,7 +112,8 @@ async def create_session(request: CreateSessionRequest = CreateSessionRequest())
         # Create session
         session_id = session_manager.create_session(
             user_preferences=preferences_dict,
-            user_agent=request.user_agent
+            user_agent=request.user_agent,
+            user_ip=http_request.client.host if http_request.client else ""
         )
         
         # Get created session
@@ -97,40 +121,44 @@ async def create_session(request: CreateSessionRequest = CreateSessionRequest())
         
         logger.info(f"Created session {session_id}")
         
-        return SessionResponse(
-            session_id=session.session_id,
-            state=session.state.value,
-            created_at=session.created_at.isoformat(),
-            expires_at=session.expires_at.isoformat()
-        )
+        # Build the SessionResponse payload directly; the fields come from
+        # already-validated server data so no model instance is needed
+        response = {
+            "session_id": session.session_id,
+            "state": STATE_VALUES[session.state],
+            "created_at": session.created_at.isoformat(),
+            "expires_at": session.expires_at.isoformat()
+        }
+        
+        return APIResponse(content=response, status_code=201)
         
-    except ConcurrencyLimitError as e:
-        raise HTTPException(status_code=429, detail=str(e))
+    except ConcurrencyLimitError:
+        raise  # Rendered as 429 CONCURRENCY_LIMIT_EXCEEDED by the app-level handler
     except Exception as e:
         logger.error(f"Failed to create session: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to create session")
 
 
-@router.get("/sessions/{session_id}", response_model=SessionDetail)
-async def get_session(session_id: str):
-    """Get session details"""
+@router.get("/sessions/{session_id}", responses={200: {"model": SessionDetail}})
+async def get_session(session_id: str, request: Request):
+    """Get session details (supports If-None-Match)"""
     try:
         session = session_manager.get_session(session_id)
         session_data = session_manager.get_session_data(session_id)
         
-        # Build detailed response
-        detail = SessionDetail(
-            session_id=session.session_id,
-            state=session.state.value,
-            created_at=session.created_at.isoformat(),
-            expires_at=session.expires_at.isoformat(),
-            audio_file=None,  # Would populate from actual audio data
-            supplementary_content=[],  # Would populate from actual content
-            processing_status=session_data.processing_status.to_dict() if session_data.processing_status else None,
-            generated_summary=None  # Would populate from actual summary
-        )
+        # Build detailed response (SessionDetail shape)
+        detail = {
+            "session_id": session.session_id,
+            "state": STATE_VALUES[session.state],
+            "created_at": session.created_at.isoformat(),
+            "expires_at": session.expires_at.isoformat(),
+            "audio_file": None,  # Would populate from actual audio data
+            "supplementary_content": [],  # Would populate from actual content
+            "processing_status": session_data.processing_status.to_dict() if session_data.processing_status else None,
+            "generated_summary": None  # Would populate from actual summary
+        }
         
-        return detail
+        return conditional_response(request, detail)
         
     except SessionNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
@@ -156,7 +184,7 @@ async def delete_session(session_id: str):
         raise HTTPException(status_code=500, detail="Failed to delete session")
 
 
-@router.post("/sessions/{session_id}/audio", response_model=AudioUploadResponse, status_code=201)
+@router.post("/sessions/{session_id}/audio", status_code=201, responses={201: {"model": AudioUploadResponse}})
 async def upload_audio(session_id: str, audio_file: UploadFile = File(...)):
     """Upload audio file for tutorial processing"""
     try:
@@ -167,41 +195,34 @@ async def upload_audio(session_id: str, audio_file: UploadFile = File(...)):
         if not audio_file.filename:
             raise HTTPException(status_code=400, detail="No filename provided")
             
-        # Check file size (30MB limit)
-        MAX_SIZE = 30 * 1024 * 1024  # 30MB
-        content = await audio_file.read()
-        if len(content) > MAX_SIZE:
-            raise HTTPException(status_code=413, detail="File size exceeds 30MB limit")
-        
         # Validate MIME type and file extension
-        allowed_types = ["audio/mp3", "audio/mpeg", "audio/wav", "audio/m4a", "audio/mp4", "audio/ogg", "application/octet-stream"]
-        allowed_extensions = [".mp3", ".wav", ".m4a", ".mp4", ".ogg"]
-        
         logger.info(f"Received file with content type: {audio_file.content_type}, filename: {audio_file.filename}")
         
         # Check if content type is valid or if it's octet-stream with valid extension
-        file_extension = audio_file.filename.lower().split('.')[-1] if audio_file.filename else ""
-        is_valid_extension = any(audio_file.filename.lower().endswith(ext) for ext in allowed_extensions)
+        is_valid_extension = audio_file.filename.lower().endswith(ALLOWED_AUDIO_EXTENSIONS)
         
-        if audio_file.content_type not in allowed_types and not is_valid_extension:
-            raise HTTPException(status_code=400, detail=f"Invalid file format. Received: {audio_file.content_type}, Supported extensions: {allowed_extensions}")
+        if audio_file.content_type not in ALLOWED_AUDIO_TYPES and not is_valid_extension:
+            raise HTTPException(status_code=400, detail=f"Invalid file format. Received: {audio_file.content_type}, Supported extensions: {list(ALLOWED_AUDIO_EXTENSIONS)}")
         
         if audio_file.content_type == "application/octet-stream" and not is_valid_extension:
-            raise HTTPException(status_code=400, detail=f"Invalid file format. File extension must be one of: {allowed_extensions}")
+            raise HTTPException(status_code=400, detail=f"Invalid file format. File extension must be one of: {list(ALLOWED_AUDIO_EXTENSIONS)}")
         
-        # Create workspace and save file
-        workspace = session_manager.create_workspace(session_id)
-        audio_path = workspace / "files" / "audio" / "original" / audio_file.filename
-        audio_path.parent.mkdir(parents=True, exist_ok=True)
+        # Check file size (30MB limit) before copying anything
+        audio_file.file.seek(0, os.SEEK_END)
+        file_size = audio_file.file.tell()
+        audio_file.file.seek(0)
+        if file_size > MAX_AUDIO_SIZE:
+            raise HTTPException(status_code=413, detail="File size exceeds 30MB limit")
         
-        # Save file
-        with open(audio_path, "wb") as f:
-            f.write(content)
+        # Create workspace and save file off the event loop
+        audio_path = await asyncio.to_thread(
+            _save_audio_upload, session_id, audio_file.file, audio_file.filename
+        )
         
         # Create AudioRecording model
         audio_recording = AudioRecording.create_from_upload(
             file_name=audio_file.filename,
-            file_content=content,
+            file_size_bytes=file_size,
             mime_type=audio_file.content_type,
             temporary_path=audio_path
         )
@@ -211,22 +232,28 @@ async def upload_audio(session_id: str, audio_file: UploadFile = File(...)):
         
         logger.info(f"Uploaded audio file {audio_file.filename} to session {session_id}")
         
-        # Build response
-        file_info = AudioFileInfo(
-            file_name=audio_recording.file_name,
-            file_size_mb=audio_recording.file_size_mb,
-            duration_seconds=audio_recording.duration_seconds,
-            mime_type=audio_recording.mime_type,
-            quality_metrics=audio_recording.quality_metrics.to_dict() if audio_recording.quality_metrics else None
-        )
+        # Build response (AudioUploadResponse shape)
+        file_info = {
+            "file_name": audio_recording.file_name,
+            "file_size_mb": audio_recording.file_size_mb,
+            "duration_seconds": audio_recording.duration_seconds,
+            "mime_type": audio_recording.mime_type,
+            "quality_metrics": audio_recording.quality_metrics.to_dict() if audio_recording.quality_metrics else None
+        }
         
-        return AudioUploadResponse(
-            file_info=file_info,
-            session_state="AUDIO_UPLOADED"
-        )
+        response = {
+            "file_info": file_info,
+            "session_state": "AUDIO_UPLOADED"
+        }
         
+        return APIResponse(content=response, status_code=201)
+        
+    except HTTPException:
+        raise
     except SessionNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
+    except StorageQuotaExceededError as e:
+        raise HTTPException(status_code=413, detail=str(e))
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
@@ -256,17 +283,17 @@ class ProcessingStartedResponse(BaseModel):
     estimated_completion: Optional[str] = None
 
 
-@router.post("/sessions/{session_id}/process", response_model=ProcessingStartedResponse, status_code=202)
+@router.post("/sessions/{session_id}/process", status_code=202, responses={202: {"model": ProcessingStartedResponse}})
 async def start_processing(session_id: str, request: ProcessingRequest):
     """Start processing the tutorial content"""
     try:
         # Validate session exists and is in correct state
         session = session_manager.get_session(session_id)
         
-        if session.state not in [WorkflowState.AUDIO_UPLOADED, WorkflowState.CONTENT_ADDED]:
+        if session.state not in PROCESSING_READY_STATES:
             raise HTTPException(
                 status_code=409, 
-                detail=f"Session not ready for processing. Current state: {session.state.value}"
+                detail=f"Session not ready for processing. Current state: {STATE_VALUES[session.state]}"
             )
         
         # Get session data and start processing
@@ -281,11 +308,16 @@ async def start_processing(session_id: str, request: ProcessingRequest):
         
         logger.info(f"Started processing for session {session_id} with duration {request.summary_duration}min")
         
-        return ProcessingStartedResponse(
-            task_id=processing_status.task_id,
-            session_state="PROCESSING"
-        )
+        response = {
+            "task_id": processing_status.task_id,
+            "session_state": "PROCESSING",
+            "estimated_completion": None
+        }
         
+        return APIResponse(content=response, status_code=202)
+        
+    except HTTPException:
+        raise
     except SessionNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
     except ValueError as e:
@@ -296,8 +328,12 @@ async def start_processing(session_id: str, request: ProcessingRequest):
 
 
 @router.get("/sessions/{session_id}/status")
-async def get_processing_status(session_id: str):
-    """Get processing status"""
+async def get_processing_status(
+    session_id: str,
+    request: Request,
+    wait: float = Query(0, ge=0, le=MAX_STATUS_WAIT_SECONDS, description="Seconds to hold the request open until the status changes")
+):
+    """Get processing status, optionally long-polling until it changes (supports If-None-Match)"""
     try:
         session = session_manager.get_session(session_id)
         session_data = session_manager.get_session_data(session_id)
@@ -305,7 +341,13 @@ async def get_processing_status(session_id: str):
         if not session_data.processing_status:
             raise HTTPException(status_code=404, detail="No processing status available")
         
-        return session_data.processing_status.to_dict()
+        if wait and session_data.processing_status.status not in PROCESSING_TERMINAL_STATUSES:
+            await session_data.wait_for_status_change(wait)
+        
+        # Include the workflow state so pollers don't need a second GET to notice the session moving on
+        status = session_data.processing_status.to_dict()
+        status["session_state"] = STATE_VALUES[session.state]
+        return conditional_response(request, status)
         
     except SessionNotFoundError as e:
         raise HTTPException(status_code=404, detail=str(e))
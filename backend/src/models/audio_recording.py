@@ -15,7 +15,7 @@ class AudioProcessingStatus(Enum):
     ERROR = "ERROR"
 
 
-@dataclass
+@dataclass(slots=True)
 class QualityMetrics:
     """Audio quality indicators"""
     signal_to_noise_ratio: float = 0.0
@@ -33,7 +33,7 @@ class QualityMetrics:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class AudioRecording:
     """Contains the primary tutorial audio file and associated metadata"""
     
@@ -57,29 +57,14 @@ class AudioRecording:
     def create_from_upload(
         cls,
         file_name: str,
-        file_content: bytes,
+        file_size_bytes: int,
         mime_type: str,
         temporary_path: Path
     ) -> "AudioRecording":
-        """Create AudioRecording from uploaded file"""
-        # Validate file size (30MB limit)
-        max_size = 30 * 1024 * 1024  # 30MB in bytes
-        if len(file_content) > max_size:
-            raise ValueError(f"File size {len(file_content)} exceeds maximum of {max_size} bytes")
-        
-        # Validate MIME type (allow application/octet-stream for generic binary files)
-        allowed_types = ["audio/mp3", "audio/mpeg", "audio/wav", "audio/m4a", "audio/mp4", "audio/ogg", "application/octet-stream"]
-        if mime_type not in allowed_types:
-            raise ValueError(f"Unsupported MIME type: {mime_type}")
-        
-        # Save file to temporary path
-        temporary_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(temporary_path, "wb") as f:
-            f.write(file_content)
-        
+        """Create AudioRecording for an upload already validated and saved at temporary_path"""
         return cls(
             file_name=file_name,
-            file_size_bytes=len(file_content),
+            file_size_bytes=file_size_bytes,
             mime_type=mime_type,
             upload_timestamp=datetime.now(),
             processing_status=AudioProcessingStatus.UPLOADED,
@@ -119,14 +104,18 @@ class AudioRecording:
             self.temporary_path.unlink()
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for API responses"""
+        """Convert to dictionary for API responses
+        
+        Datetime and enum values are left as-is; the orjson response
+        renderer encodes them natively.
+        """
         return {
             "file_name": self.file_name,
             "file_size_bytes": self.file_size_bytes,
             "file_size_mb": self.file_size_mb,
             "mime_type": self.mime_type,
-            "upload_timestamp": self.upload_timestamp.isoformat(),
-            "processing_status": self.processing_status.value,
+            "upload_timestamp": self.upload_timestamp,
+            "processing_status": self.processing_status,
             "duration_seconds": self.duration_seconds,
             "quality_metrics": self.quality_metrics.to_dict() if self.quality_metrics else None,
             "has_transcription": self.transcription_text is not None,
@@ -1,8 +1,16 @@
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, Deque, List
+from collections import deque
+from itertools import islice
 from enum import Enum
-import uuid
+import asyncio
+import time
+
+from ..utils.ids import fast_uuid4
+
+
+MAX_ERROR_LOG_ENTRIES = 50
 
 
 class ProcessingStatusType(Enum):
@@ -13,7 +21,7 @@ class ProcessingStatusType(Enum):
     ERROR = "error"
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessingStatus:
     """Processing status information"""
     task_id: str
@@ -29,7 +37,7 @@ class ProcessingStatus:
     def create_new(cls, current_step: str = "Initializing...") -> "ProcessingStatus":
         """Create new processing status"""
         return cls(
-            task_id=str(uuid.uuid4()),
+            task_id=fast_uuid4(),
             status=ProcessingStatusType.PENDING,
             progress=0,
             current_step=current_step,
@@ -56,20 +64,24 @@ class ProcessingStatus:
         self.status = ProcessingStatusType.PROCESSING
     
     def to_dict(self) -> Dict[str, Any]:
-        """Convert to dictionary for API responses"""
+        """Convert to dictionary for API responses
+        
+        Datetime and enum values are left as-is; the orjson response
+        renderer encodes them natively.
+        """
         return {
             "task_id": self.task_id,
-            "status": self.status.value,
+            "status": self.status,
             "progress": self.progress,
             "current_step": self.current_step,
-            "start_time": self.start_time.isoformat(),
-            "estimated_completion": self.estimated_completion.isoformat() if self.estimated_completion else None,
+            "start_time": self.start_time,
+            "estimated_completion": self.estimated_completion,
             "processing_time_seconds": self.processing_time_seconds,
             "error": self.error_message
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class ResourceUsage:
     """Resource usage tracking"""
     memory_usage_mb: float = 0.0
@@ -85,25 +97,25 @@ class ResourceUsage:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class SessionData:
     """Temporary runtime data for session management and progress tracking"""
     
     current_step: str = "Session initialized"
     progress_percentage: int = 0
-    error_log: List[str] = field(default_factory=list)
+    # Error log kept as parallel arrays of epoch timestamps and messages
+    error_timestamps: Deque[float] = field(default_factory=lambda: deque(maxlen=MAX_ERROR_LOG_ENTRIES))
+    error_messages: Deque[str] = field(default_factory=lambda: deque(maxlen=MAX_ERROR_LOG_ENTRIES))
     processing_status: Optional[ProcessingStatus] = None
     resource_usage: ResourceUsage = field(default_factory=ResourceUsage)
+    # Set (and dropped) whenever processing status changes; created lazily by the first waiter
+    status_event: Optional[asyncio.Event] = None
     
     def add_error(self, error_message: str) -> None:
         """Add error to error log with timestamp"""
-        timestamp = datetime.now().isoformat()
-        formatted_error = f"[{timestamp}] {error_message}"
-        self.error_log.append(formatted_error)
-        
-        # Keep only last 50 errors
-        if len(self.error_log) > 50:
-            self.error_log = self.error_log[-50:]
+        # Both deques evict beyond the last 50 entries, so they stay aligned
+        self.error_timestamps.append(time.time())
+        self.error_messages.append(error_message)
     
     def update_progress(self, progress: int, step: str) -> None:
         """Update overall progress"""
@@ -112,6 +124,7 @@ class SessionData:
         
         if self.processing_status:
             self.processing_status.update_progress(progress, step)
+        self.notify_status_change()
     
     def start_processing(self, initial_step: str = "Starting processing...") -> ProcessingStatus:
         """Start new processing task"""
@@ -119,6 +132,7 @@ class SessionData:
         self.processing_status.mark_processing()
         self.current_step = initial_step
         self.progress_percentage = 0
+        self.notify_status_change()
         return self.processing_status
     
     def complete_processing(self) -> None:
@@ -127,6 +141,7 @@ class SessionData:
             self.processing_status.update_progress(100, "Processing completed")
         self.progress_percentage = 100
         self.current_step = "Completed"
+        self.notify_status_change()
     
     def fail_processing(self, error_message: str) -> None:
         """Mark processing as failed"""
@@ -134,6 +149,23 @@ class SessionData:
             self.processing_status.mark_error(error_message)
         self.add_error(error_message)
         self.current_step = f"Error: {error_message}"
+        self.notify_status_change()
+    
+    def notify_status_change(self) -> None:
+        """Wake every request long-polling on this session's status"""
+        event, self.status_event = self.status_event, None
+        if event is not None:
+            event.set()
+    
+    async def wait_for_status_change(self, timeout: float) -> bool:
+        """Wait up to timeout seconds for the next status change; returns False on timeout"""
+        if self.status_event is None:
+            self.status_event = asyncio.Event()
+        try:
+            await asyncio.wait_for(self.status_event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
     
     def update_resource_usage(
         self, 
@@ -149,12 +181,23 @@ class SessionData:
         if processing_time is not None:
             self.resource_usage.processing_time_seconds = processing_time
     
+    def _recent_errors(self, limit: int) -> List[Dict[str, str]]:
+        """Most recent error log entries, oldest first"""
+        start = max(0, len(self.error_messages) - limit)
+        return [
+            {"timestamp": datetime.fromtimestamp(ts).isoformat(), "message": message}
+            for ts, message in zip(
+                islice(self.error_timestamps, start, None),
+                islice(self.error_messages, start, None)
+            )
+        ]
+    
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for API responses"""
         return {
             "current_step": self.current_step,
             "progress_percentage": self.progress_percentage,
-            "error_log": self.error_log[-10:],  # Return only last 10 errors for API
+            "error_log": self._recent_errors(10),  # Return only last 10 errors for API
             "processing_status": self.processing_status.to_dict() if self.processing_status else None,
             "resource_usage": self.resource_usage.to_dict()
         }
\ No newline at end of file
@@ -3,7 +3,9 @@ from datetime import datetime, timedelta
 from enum import Enum
 from typing import Optional, Dict, Any, List
 from pathlib import Path
-import uuid
+import time
+
+from ..utils.ids import fast_uuid4
 
 
 class WorkflowState(Enum):
@@ -16,7 +18,25 @@ class WorkflowState(Enum):
     ERROR = "ERROR"
 
 
-@dataclass
+# Allowed (current, new) workflow state transitions
+_VALID_TRANSITIONS = frozenset({
+    (WorkflowState.INITIAL, WorkflowState.AUDIO_UPLOADED),
+    (WorkflowState.INITIAL, WorkflowState.ERROR),
+    (WorkflowState.AUDIO_UPLOADED, WorkflowState.CONTENT_ADDED),
+    (WorkflowState.AUDIO_UPLOADED, WorkflowState.PROCESSING),
+    (WorkflowState.AUDIO_UPLOADED, WorkflowState.ERROR),
+    (WorkflowState.CONTENT_ADDED, WorkflowState.PROCESSING),
+    (WorkflowState.CONTENT_ADDED, WorkflowState.ERROR),
+    (WorkflowState.PROCESSING, WorkflowState.COMPLETED),
+    (WorkflowState.PROCESSING, WorkflowState.ERROR),
+    (WorkflowState.COMPLETED, WorkflowState.INITIAL),  # Allow reset
+    (WorkflowState.COMPLETED, WorkflowState.ERROR),
+    (WorkflowState.ERROR, WorkflowState.PROCESSING),  # Allow retry
+    (WorkflowState.ERROR, WorkflowState.INITIAL),
+})
+
+
+@dataclass(slots=True)
 class UserPreferences:
     """User preferences for tutorial processing"""
     preferred_voice: str = "professional_female"
@@ -25,7 +45,7 @@ class UserPreferences:
     custom_terminology: Dict[str, str] = field(default_factory=dict)
 
 
-@dataclass
+@dataclass(slots=True)
 class TutorialSession:
     """Represents the main workflow session for creating a medical tutorial summary"""
     
@@ -37,6 +57,12 @@ class TutorialSession:
     user_agent: str
     user_preferences: UserPreferences = field(default_factory=UserPreferences)
     workspace_path: Optional[Path] = None
+    expires_at_mono: float = 0.0  # time.monotonic() deadline mirroring expires_at
+    
+    def __post_init__(self) -> None:
+        """Derive the monotonic expiry deadline when one isn't supplied"""
+        if not self.expires_at_mono:
+            self.expires_at_mono = time.monotonic() + (self.expires_at - datetime.now()).total_seconds()
     
     @classmethod
     def create_new(
@@ -47,7 +73,7 @@ class TutorialSession:
     ) -> "TutorialSession":
         """Create a new tutorial session"""
         now = datetime.now()
-        session_id = str(uuid.uuid4())
+        session_id = fast_uuid4()
         
         # Parse preferences
         user_prefs = UserPreferences()
@@ -64,7 +90,8 @@ class TutorialSession:
             last_updated=now,
             expires_at=now + timedelta(hours=session_timeout_hours),
             user_agent=user_agent,
-            user_preferences=user_prefs
+            user_preferences=user_prefs,
+            expires_at_mono=time.monotonic() + session_timeout_hours * 3600
         )
     
     def update_state(self, new_state: WorkflowState) -> None:
@@ -77,12 +104,14 @@ class TutorialSession:
     
     def is_expired(self) -> bool:
         """Check if session has expired"""
-        return datetime.now() > self.expires_at
+        return time.monotonic() > self.expires_at_mono
     
     def extend_expiration(self, additional_hours: int = 4) -> None:
         """Extend session expiration time"""
-        self.expires_at = datetime.now() + timedelta(hours=additional_hours)
-        self.last_updated = datetime.now()
+        now = datetime.now()
+        self.expires_at = now + timedelta(hours=additional_hours)
+        self.expires_at_mono = time.monotonic() + additional_hours * 3600
+        self.last_updated = now
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert session to dictionary for API responses"""
@@ -104,13 +133,4 @@ class TutorialSession:
     @staticmethod
     def _is_valid_state_transition(current: WorkflowState, new: WorkflowState) -> bool:
         """Validate state transitions"""
-        valid_transitions = {
-            WorkflowState.INITIAL: [WorkflowState.AUDIO_UPLOADED, WorkflowState.ERROR],
-            WorkflowState.AUDIO_UPLOADED: [WorkflowState.CONTENT_ADDED, WorkflowState.PROCESSING, WorkflowState.ERROR],
-            WorkflowState.CONTENT_ADDED: [WorkflowState.PROCESSING, WorkflowState.ERROR],
-            WorkflowState.PROCESSING: [WorkflowState.COMPLETED, WorkflowState.ERROR],
-            WorkflowState.COMPLETED: [WorkflowState.INITIAL, WorkflowState.ERROR],  # Allow reset
-            WorkflowState.ERROR: [WorkflowState.PROCESSING, WorkflowState.INITIAL]  # Allow retry
-        }
-        
-        return new in valid_transitions.get(current, [])
\ No newline at end of file
+        return (current, new) in _VALID_TRANSITIONS
\ No newline at end of file
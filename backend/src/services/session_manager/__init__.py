@@ -1,18 +1,29 @@
 import os
-import json
+import errno
+import heapq
+import logging
+import sched
 import threading
+import weakref
 from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Dict, Optional, List, Iterator, IO, Any, Set
-from collections import defaultdict
+from typing import Dict, DefaultDict, Optional, List, Iterator, IO, Any, Set, Tuple
+from collections import defaultdict, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from filelock import FileLock
-import uuid
+import orjson
 import shutil
+import tempfile
+import time
 
 from ...models.tutorial_session import TutorialSession, WorkflowState
 from ...models.session_data import SessionData, ProcessingStatus
 
 
+logger = logging.getLogger(__name__)
+
+
 class SessionManagerError(Exception):
     """Base exception for session manager operations"""
     pass
@@ -43,32 +54,119 @@ class FileLockTimeoutError(SessionManagerError):
     pass
 
 
+def _walk_size(root: Path) -> int:
+    """Sum regular file sizes under root using os.scandir's cached dirent data"""
+    total_size = 0
+    stack = [str(root)]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        total_size += entry.stat(follow_symlinks=False).st_size
+        except (FileNotFoundError, NotADirectoryError):
+            continue  # Missing root, or removed while walking
+    return total_size
+
+
+def _stream_fileno(stream: IO[bytes]) -> Optional[int]:
+    """OS file descriptor backing a stream, or None for in-memory streams"""
+    if isinstance(stream, tempfile.SpooledTemporaryFile) and not stream._rolled:
+        return None  # Asking for fileno() would force a rollover to disk
+    try:
+        return stream.fileno()
+    except (AttributeError, OSError, ValueError):
+        return None
+
+
 class EnhancedSessionManager:
     """Enhanced session manager with streaming operations and storage management"""
     
-    MAX_CONCURRENT_SESSIONS = 5
+    MAX_CONCURRENT_SESSIONS = 5  # Per client IP
     MAX_SESSION_STORAGE = 100 * 1024 * 1024  # 100MB per session
     MAX_TOTAL_STORAGE = 1024 * 1024 * 1024   # 1GB total
     STREAMING_CHUNK_SIZE = 1024 * 1024       # 1MB chunks
     SESSION_TIMEOUT = 14400  # 4 hours in seconds
+    FILE_LOCK_TIMEOUT = 30  # Seconds to wait for a per-file lock
+    DELETED_PREFIX = ".deleted-"  # Session dirs renamed aside, pending background removal
+    WORKSPACE_LEAF_DIRS = (
+        'metadata/locks', 'files/audio/original', 'files/audio/processed',
+        'files/pdfs', 'files/generated/scripts', 'files/generated/audio',
+        'temp', 'logs'
+    )
+    NEGATIVE_CACHE_SIZE = 1024  # Unknown session IDs remembered
+    NEGATIVE_CACHE_TTL = 60  # Seconds before an unknown ID is looked up on disk again
+    REAPER_INTERVAL = 60  # Seconds between expired-session sweeps
+    REAPER_BATCH_SIZE = 100  # Max sessions ended per sweep
+    ORPHAN_SCAN_INTERVAL = 600  # Seconds between on-disk orphan scans
     
-    def __init__(self, storage_root: Optional[str] = None):
+    def __init__(self, storage_root: Optional[str] = None, multi_process: Optional[bool] = None):
         self.storage_root = Path(storage_root or os.getenv('CLINIPROMPT_STORAGE_ROOT', '/tmp/cliniprompt'))
+        if multi_process is None:
+            multi_process = os.getenv('CLINIPROMPT_MULTI_PROCESS', 'false').lower() == 'true'
+        self.multi_process = multi_process
         self.active_sessions: Dict[str, TutorialSession] = {}
+        # Immutable copy of active_sessions for lock-free reads; replaced (never
+        # mutated) under session_lock whenever active_sessions changes
+        self._sessions_snapshot: Dict[str, TutorialSession] = {}
+        # Min-heap of (expires_at_mono, session_id); entries superseded by an
+        # extension are left in place and skipped when popped
+        self._expiry_heap: List[Tuple[float, str]] = []
         self.session_data: Dict[str, SessionData] = {}
-        self.processing_files: Dict[str, Set[str]] = defaultdict(set)  # {session_id: {file_paths}}
+        self.processing_files: Dict[str, DefaultDict[str, Set[str]]] = {}  # {session_id: {file_path: {services}}}
+        self.sessions_by_ip: Dict[str, Set[str]] = defaultdict(set)  # {client_ip: {session_ids}}
+        self.session_ips: Dict[str, str] = {}  # {session_id: client_ip}
         self.session_lock = threading.RLock()
         self.file_locks: Dict[str, FileLock] = {}
+        self._path_locks: "weakref.WeakValueDictionary[str, threading.Lock]" = weakref.WeakValueDictionary()
+        
+        # Running byte counters so quota checks don't walk the storage tree;
+        # each is seeded lazily from disk on first use
+        self._session_bytes: Dict[str, int] = {}
+        self._total_bytes: Optional[int] = None
+        
+        # Recently missed session IDs -> monotonic time of the failed lookup
+        self._neg_ids: "OrderedDict[str, float]" = OrderedDict()
+        
+        # Last metadata written per session, keyed by its last_updated timestamp
+        self._meta_cache: Dict[str, Tuple[datetime, bytes]] = {}
+        
+        # Workspace paths of active sessions (unknown IDs aren't cached)
+        self._session_paths: Dict[str, Path] = {}
         
         # Create storage root directory
         self.storage_root.mkdir(parents=True, exist_ok=True)
+        
+        # Bounded pool that removes renamed-aside session trees off the request path
+        self._cleanup_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="cleanup")
+        
+        # Single background scheduler thread for session reaping and grace-period
+        # cleanups (keeps rmtree off the request path with a bounded thread count)
+        self.reaper_interval = float(os.getenv('CLINIPROMPT_REAPER_INTERVAL', self.REAPER_INTERVAL))
+        self.orphan_scan_interval = float(os.getenv('CLINIPROMPT_ORPHAN_SCAN_INTERVAL', self.ORPHAN_SCAN_INTERVAL))
+        self._grace_pending: Set[str] = set()  # Sessions with a grace-period cleanup already scheduled
+        self._scheduler_stop = threading.Event()
+        self._scheduler = sched.scheduler(time.monotonic, self._scheduler_stop.wait)
+        self._scheduler.enter(self.reaper_interval, 2, self._reap_tick)
+        self._scheduler.enter(self.orphan_scan_interval, 3, self._orphan_scan_tick)
+        self._scheduler_thread = threading.Thread(target=self._scheduler.run, name="session-scheduler", daemon=True)
+        self._scheduler_thread.start()
     
-    def create_session(self, user_preferences: Optional[Dict[str, Any]] = None, user_agent: str = "") -> str:
+    def create_session(
+        self,
+        user_preferences: Optional[Dict[str, Any]] = None,
+        user_agent: str = "",
+        user_ip: str = ""
+    ) -> str:
         """Create new tutorial session"""
         with self.session_lock:
-            # Check concurrent session limit (simplified - would need IP tracking in real implementation)
-            if len(self.active_sessions) >= self.MAX_CONCURRENT_SESSIONS:
-                raise ConcurrencyLimitError(f"Maximum {self.MAX_CONCURRENT_SESSIONS} concurrent sessions")
+            # Check concurrent session limit for this client
+            if len(self.sessions_by_ip.get(user_ip, ())) >= self.MAX_CONCURRENT_SESSIONS:
+                raise ConcurrencyLimitError(
+                    f"Too many concurrent sessions (maximum {self.MAX_CONCURRENT_SESSIONS} per client)"
+                )
             
             # Create session
             session = TutorialSession.create_new(
@@ -77,15 +175,24 @@ class EnhancedSessionManager:
             )
             
             # Create workspace
+            self._session_paths[session.session_id] = self.storage_root / "sessions" / session.session_id
             workspace_path = self._create_session_workspace(session.session_id)
             session.workspace_path = workspace_path
             
-            # Initialize session data
+            self._neg_ids.pop(session.session_id, None)
+            
+            # Initialize session data and storage counters (new workspace holds no files)
             session_data = SessionData()
+            self._total_storage_bytes()
+            self._session_bytes[session.session_id] = 0
             
             # Store session
             self.active_sessions[session.session_id] = session
+            self._sessions_snapshot = dict(self.active_sessions)
+            heapq.heappush(self._expiry_heap, (session.expires_at_mono, session.session_id))
             self.session_data[session.session_id] = session_data
+            self.sessions_by_ip[user_ip].add(session.session_id)
+            self.session_ips[session.session_id] = user_ip
             
             # Save session metadata
             self._save_session_metadata(session)
@@ -94,20 +201,32 @@ class EnhancedSessionManager:
     
     def get_session(self, session_id: str) -> TutorialSession:
         """Get session by ID"""
-        with self.session_lock:
-            if session_id not in self.active_sessions:
-                # Try to load from storage
-                if not self._load_session_from_storage(session_id):
-                    raise SessionNotFoundError(f"Session {session_id} not found")
-            
-            session = self.active_sessions[session_id]
-            
-            # Check if expired
-            if session.is_expired():
-                self.end_session(session_id)
-                raise SessionNotFoundError(f"Session {session_id} has expired")
-            
-            return session
+        # Fast path: lock-free lookup in the published snapshot
+        session = self._sessions_snapshot.get(session_id)
+        if session is None:
+            with self.session_lock:
+                if session_id not in self.active_sessions:
+                    # Short-circuit IDs that recently failed to load
+                    missed_at = self._neg_ids.get(session_id)
+                    if missed_at is not None:
+                        if time.monotonic() - missed_at < self.NEGATIVE_CACHE_TTL:
+                            raise SessionNotFoundError(f"Session {session_id} not found")
+                        del self._neg_ids[session_id]
+                    
+                    # Try to load from storage
+                    if not self._load_session_from_storage(session_id):
+                        self._neg_ids[session_id] = time.monotonic()
+                        if len(self._neg_ids) > self.NEGATIVE_CACHE_SIZE:
+                            self._neg_ids.popitem(last=False)
+                        raise SessionNotFoundError(f"Session {session_id} not found")
+                
+                session = self.active_sessions[session_id]
+        
+        # Check if expired (files are removed by the background reaper)
+        if session.is_expired():
+            raise SessionNotFoundError(f"Session {session_id} has expired")
+        
+        return session
     
     def update_session_state(self, session_id: str, new_state: WorkflowState) -> bool:
         """Update session state"""
@@ -122,6 +241,15 @@ class EnhancedSessionManager:
         except (SessionNotFoundError, ValueError):
             return False
     
+    def extend_session(self, session_id: str, additional_hours: int = 4) -> TutorialSession:
+        """Push back a session's expiry"""
+        session = self.get_session(session_id)
+        with self.session_lock:
+            session.extend_expiration(additional_hours)
+            heapq.heappush(self._expiry_heap, (session.expires_at_mono, session_id))
+        self._save_session_metadata(session)
+        return session
+    
     def end_session(self, session_id: str) -> bool:
         """End session and cleanup files"""
         with self.session_lock:
@@ -135,6 +263,7 @@ class EnhancedSessionManager:
                 # Remove from active sessions
                 if session_id in self.active_sessions:
                     del self.active_sessions[session_id]
+                    self._sessions_snapshot = dict(self.active_sessions)
                 
                 if session_id in self.session_data:
                     del self.session_data[session_id]
@@ -142,6 +271,18 @@ class EnhancedSessionManager:
                 if session_id in self.processing_files:
                     del self.processing_files[session_id]
                 
+                self._meta_cache.pop(session_id, None)
+                
+                # Release the client's concurrency slot
+                user_ip = self.session_ips.pop(session_id, None)
+                if user_ip is not None:
+                    ip_sessions = self.sessions_by_ip[user_ip]
+                    ip_sessions.discard(session_id)
+                    if not ip_sessions:
+                        del self.sessions_by_ip[user_ip]
+                
+                self._session_paths.pop(session_id, None)
+                
                 # Cleanup files
                 return self.cleanup_session_files(session_id)
                 
@@ -176,29 +317,38 @@ class EnhancedSessionManager:
         
         # Use file locking to prevent concurrent access
         lock_path = session_path / "metadata" / "locks" / f"{filename}.lock"
-        lock_path.parent.mkdir(parents=True, exist_ok=True)
         
+        total_written = 0
         try:
-            with FileLock(str(lock_path), timeout=30):
+            with self._file_lock(lock_path):
                 file_path.parent.mkdir(parents=True, exist_ok=True)
                 
+                # Overwriting an existing file releases its bytes first
+                if file_path.exists():
+                    self.track_storage(session_id, -file_path.stat().st_size)
+                
                 with open(file_path, 'wb') as f:
-                    total_written = 0
-                    while True:
-                        chunk = file_stream.read(self.STREAMING_CHUNK_SIZE)
-                        if not chunk:
-                            break
-                        f.write(chunk)
-                        total_written += len(chunk)
+                    if file_size:
+                        self._reserve_space(f, file_size)
+                    
+                    for written in self._copy_stream(file_stream, f):
+                        total_written += written
+                        self.track_storage(session_id, written)
                         
                         # Check quota during write
                         if total_written > self.MAX_SESSION_STORAGE:
-                            file_path.unlink()  # Delete partial file
                             raise StorageQuotaExceededError("File size exceeded during upload")
+                    
+                    # Drop any reserved tail the stream did not fill
+                    if total_written < file_size:
+                        f.truncate(total_written)
                             
         except Exception as e:
+            self.track_storage(session_id, -total_written)
             if file_path.exists():
                 file_path.unlink()
+            if isinstance(e, StorageQuotaExceededError):
+                raise
             raise SessionStorageError(f"Failed to save file: {str(e)}")
                         
         return file_path
@@ -209,7 +359,7 @@ class EnhancedSessionManager:
         lock_path = self._get_lock_path(session_id, file_path)
         
         try:
-            with FileLock(str(lock_path), timeout=30):
+            with self._file_lock(lock_path):
                 with open(full_path, 'rb') as f:
                     while True:
                         chunk = f.read(self.STREAMING_CHUNK_SIZE)
@@ -222,23 +372,34 @@ class EnhancedSessionManager:
     def mark_file_processing(self, session_id: str, file_path: str, service_name: str) -> bool:
         """Mark file as being processed by service"""
         with self.session_lock:
-            self.processing_files[session_id].add(f"{file_path}:{service_name}")
+            files = self.processing_files.get(session_id)
+            if files is None:
+                files = self.processing_files[session_id] = defaultdict(set)
+            files[file_path].add(service_name)
             return True
             
     def unmark_file_processing(self, session_id: str, file_path: str, service_name: str) -> bool:
         """Unmark file when processing complete"""
         with self.session_lock:
-            self.processing_files[session_id].discard(f"{file_path}:{service_name}")
+            files = self.processing_files.get(session_id)
+            if files is not None and file_path in files:
+                services = files[file_path]
+                services.discard(service_name)
+                if not services:
+                    del files[file_path]
+                    if not files:
+                        del self.processing_files[session_id]
             return True
             
     def can_cleanup_session(self, session_id: str) -> bool:
         """Check if session can be safely cleaned up"""
-        return len(self.processing_files[session_id]) == 0
+        return not self.processing_files.get(session_id)
     
     def check_storage_quota(self, session_id: str, file_size: int) -> bool:
         """Check if adding file would exceed quotas"""
-        current_session_size = self._get_session_storage_size(session_id)
-        current_total_size = self._get_total_storage_size()
+        with self.session_lock:
+            current_session_size = self._session_storage_bytes(session_id)
+            current_total_size = self._total_storage_bytes()
         
         if current_session_size + file_size > self.MAX_SESSION_STORAGE:
             return False
@@ -246,10 +407,19 @@ class EnhancedSessionManager:
         if current_total_size + file_size > self.MAX_TOTAL_STORAGE:
             # Try to cleanup old sessions to make room
             self._cleanup_oldest_sessions(file_size)
-            return self._get_total_storage_size() + file_size <= self.MAX_TOTAL_STORAGE
+            with self.session_lock:
+                return self._total_storage_bytes() + file_size <= self.MAX_TOTAL_STORAGE
             
         return True
     
+    def track_storage(self, session_id: str, delta: int) -> None:
+        """Adjust cached storage counters after bytes are written to or removed from a session"""
+        if not delta:
+            return
+        with self.session_lock:
+            self._session_bytes[session_id] = self._session_storage_bytes(session_id) + delta
+            self._total_bytes = self._total_storage_bytes() + delta
+    
     def cleanup_session_files(self, session_id: str, force: bool = False) -> bool:
         """Remove all files for a session"""
         if not force and not self.can_cleanup_session(session_id):
@@ -257,22 +427,32 @@ class EnhancedSessionManager:
         
         try:
             session_path = self._get_session_path(session_id)
-            if session_path.exists():
-                shutil.rmtree(session_path)
+            exists = session_path.exists()
+            with self.session_lock:
+                if exists:
+                    freed = self._session_storage_bytes(session_id)
+                    self._total_bytes = self._total_storage_bytes() - freed
+                # Drop the cached byte count even when the directory is already gone
+                self._session_bytes.pop(session_id, None)
+            
+            if exists:
+                # Atomically move the tree aside so later lookups see nothing,
+                # then let the cleanup pool do the slow unlinking
+                deleted_path = session_path.with_name(f"{self.DELETED_PREFIX}{session_id}-{os.urandom(4).hex()}")
+                os.rename(session_path, deleted_path)
+                self._cleanup_pool.submit(self._rmtree_blocking, deleted_path)
             return True
         except Exception as e:
             raise SessionStorageError(f"Failed to cleanup session files: {str(e)}")
     
     def cleanup_with_grace_period(self, session_id: str, grace_minutes: int = 5) -> None:
         """Attempt cleanup with grace period for active processing"""
-        def delayed_cleanup():
-            import time
-            time.sleep(grace_minutes * 60)
-            if self.can_cleanup_session(session_id):
-                self.cleanup_session_files(session_id, force=True)
-        
         if not self.can_cleanup_session(session_id):
-            threading.Thread(target=delayed_cleanup, daemon=True).start()
+            with self.session_lock:
+                if session_id in self._grace_pending:
+                    return  # Repeated end_session calls (e.g. each reaper sweep) share one scheduled cleanup
+                self._grace_pending.add(session_id)
+            self._scheduler.enter(grace_minutes * 60, 1, self._grace_cleanup, (session_id,))
         else:
             self.cleanup_session_files(session_id)
     
@@ -282,33 +462,144 @@ class EnhancedSessionManager:
             self.session_data[session_id] = SessionData()
         return self.session_data[session_id]
     
+    def reap_expired_sessions(self) -> int:
+        """End up to REAPER_BATCH_SIZE expired sessions; returns the number ended"""
+        now = time.monotonic()
+        expired: List[Tuple[float, str]] = []
+        with self.session_lock:
+            heap = self._expiry_heap
+            while heap and heap[0][0] < now and len(expired) < self.REAPER_BATCH_SIZE:
+                entry = heapq.heappop(heap)
+                session = self.active_sessions.get(entry[1])
+                if session is not None and session.expires_at_mono == entry[0]:
+                    expired.append(entry)
+        
+        for entry in expired:
+            session_id = entry[1]
+            try:
+                self.end_session(session_id)
+            except SessionManagerError as e:
+                logger.warning(f"Failed to reap session {session_id}: {str(e)}")
+            
+            # Still held (cleanup deferred or failed): retry on the next sweep
+            if session_id in self.active_sessions:
+                with self.session_lock:
+                    heapq.heappush(self._expiry_heap, entry)
+        return len(expired)
+    
+    def reap_orphaned_sessions(self) -> int:
+        """Remove on-disk sessions not held in memory whose metadata has expired"""
+        sessions_root = self.storage_root / "sessions"
+        with self.session_lock:
+            active_ids = set(self.active_sessions)
+        
+        now = datetime.now()
+        reaped = 0
+        try:
+            entries = [entry.name for entry in os.scandir(sessions_root) if entry.is_dir(follow_symlinks=False)]
+        except FileNotFoundError:
+            return 0
+        
+        for session_id in entries:
+            if session_id.startswith(self.DELETED_PREFIX):
+                # Left behind by an interrupted background removal
+                self._cleanup_pool.submit(self._rmtree_blocking, sessions_root / session_id)
+                continue
+            if session_id in active_ids:
+                continue
+            metadata_path = sessions_root / session_id / "metadata" / "session.json"
+            try:
+                with open(metadata_path, 'rb') as f:
+                    expires_at = datetime.fromisoformat(orjson.loads(f.read())["expires_at"])
+            except (OSError, ValueError, KeyError):
+                continue  # No readable metadata yet; leave it alone
+            
+            if expires_at < now:
+                try:
+                    self.cleanup_session_files(session_id, force=True)
+                    reaped += 1
+                except SessionStorageError as e:
+                    logger.warning(f"Failed to reap orphaned session {session_id}: {str(e)}")
+        return reaped
+    
+    def stop_scheduler(self) -> None:
+        """Stop the background scheduler thread, dropping pending events"""
+        self._scheduler_stop.set()
+        for event in self._scheduler.queue:
+            try:
+                self._scheduler.cancel(event)
+            except ValueError:
+                pass  # Already ran
+        with self.session_lock:
+            self._grace_pending.clear()
+    
     # Private helper methods
+    def _reap_tick(self) -> None:
+        """Scheduled: end expired sessions, then reschedule"""
+        try:
+            self.reap_expired_sessions()
+        except Exception as e:
+            logger.error(f"Session reaper iteration failed: {str(e)}", exc_info=True)
+        if not self._scheduler_stop.is_set():
+            self._scheduler.enter(self.reaper_interval, 2, self._reap_tick)
+    
+    def _orphan_scan_tick(self) -> None:
+        """Scheduled: scavenge orphaned sessions on disk, then reschedule"""
+        try:
+            self.reap_orphaned_sessions()
+        except Exception as e:
+            logger.error(f"Orphaned session scan failed: {str(e)}", exc_info=True)
+        if not self._scheduler_stop.is_set():
+            self._scheduler.enter(self.orphan_scan_interval, 3, self._orphan_scan_tick)
+    
+    def _grace_cleanup(self, session_id: str) -> None:
+        """Scheduled: remove session files once no service is still processing them"""
+        with self.session_lock:
+            self._grace_pending.discard(session_id)
+        if not self.can_cleanup_session(session_id):
+            return
+        try:
+            self.cleanup_session_files(session_id, force=True)
+        except SessionStorageError as e:
+            logger.warning(f"Grace-period cleanup failed for session {session_id}: {str(e)}")
+    
     def _create_session_workspace(self, session_id: str) -> Path:
         """Create session workspace with proper permissions and structure"""
         session_path = self._get_session_path(session_id)
         
-        # Create directory structure
-        subdirs = ['metadata', 'files/audio/original', 'files/audio/processed', 
-                  'files/pdfs', 'files/generated/scripts', 'files/generated/audio', 
-                  'temp', 'logs', 'metadata/locks']
-        
-        for subdir in subdirs:
-            (session_path / subdir).mkdir(parents=True, exist_ok=True, mode=0o700)
+        # Create directory structure: only leaf directories, letting makedirs
+        # create shared intermediates (metadata/, files/audio/, ...) once
+        session_path.mkdir(parents=True, exist_ok=True, mode=0o700)
+        for subdir in self.WORKSPACE_LEAF_DIRS:
+            os.makedirs(session_path / subdir, mode=0o700, exist_ok=True)
             
         return session_path
     
     def _get_session_path(self, session_id: str) -> Path:
         """Get path to session directory"""
-        return self.storage_root / "sessions" / session_id
+        path = self._session_paths.get(session_id)
+        if path is None:
+            path = self.storage_root / "sessions" / session_id
+        return path
     
     def _save_session_metadata(self, session: TutorialSession) -> None:
-        """Save session metadata to disk"""
+        """Save session metadata to disk (skipped if unchanged since the last save)"""
+        cached = self._meta_cache.get(session.session_id)
+        if cached is not None and cached[0] == session.last_updated:
+            return
+        
         session_path = self._get_session_path(session.session_id)
         metadata_path = session_path / "metadata" / "session.json"
+        blob = orjson.dumps(session.to_dict())
         
+        # Write a sibling temp file and swap it in so readers never see torn JSON
         metadata_path.parent.mkdir(parents=True, exist_ok=True)
-        with open(metadata_path, 'w') as f:
-            json.dump(session.to_dict(), f, indent=2)
+        tmp_path = metadata_path.with_name(f"{metadata_path.name}.{threading.get_ident()}.tmp")
+        with open(tmp_path, 'wb') as f:
+            f.write(blob)
+        os.replace(tmp_path, metadata_path)
+        
+        self._meta_cache[session.session_id] = (session.last_updated, blob)
     
     def _load_session_from_storage(self, session_id: str) -> bool:
         """Try to load session from storage"""
@@ -319,8 +610,8 @@ class EnhancedSessionManager:
             if not metadata_path.exists():
                 return False
             
-            with open(metadata_path, 'r') as f:
-                metadata = json.load(f)
+            with open(metadata_path, 'rb') as f:
+                metadata = orjson.loads(f.read())
             
             # Reconstruct session (simplified - would need full deserialization)
             return False  # For now, don't support persistence
@@ -328,39 +619,115 @@ class EnhancedSessionManager:
         except Exception:
             return False
     
+    def _session_storage_bytes(self, session_id: str) -> int:
+        """Cached session size, seeded from disk on first access (caller holds session_lock)"""
+        size = self._session_bytes.get(session_id)
+        if size is None:
+            size = self._session_bytes[session_id] = self._get_session_storage_size(session_id)
+        return size
+    
+    def _total_storage_bytes(self) -> int:
+        """Cached total size, seeded from disk on first access (caller holds session_lock)"""
+        if self._total_bytes is None:
+            self._total_bytes = self._get_total_storage_size()
+        return self._total_bytes
+    
     def _get_session_storage_size(self, session_id: str) -> int:
         """Get total storage size for session"""
-        session_path = self._get_session_path(session_id)
-        if not session_path.exists():
-            return 0
-        
-        total_size = 0
-        for file_path in session_path.rglob('*'):
-            if file_path.is_file():
-                total_size += file_path.stat().st_size
-        return total_size
+        return _walk_size(self._get_session_path(session_id))
     
     def _get_total_storage_size(self) -> int:
         """Get total storage size across all sessions"""
-        if not self.storage_root.exists():
-            return 0
+        return _walk_size(self.storage_root)
+    
+    def _copy_stream(self, source: IO[bytes], destination: IO[bytes]) -> Iterator[int]:
+        """Copy source into destination chunk by chunk, yielding bytes written per chunk"""
+        in_fd = _stream_fileno(source)
+        if in_fd is not None and hasattr(os, "sendfile"):
+            # Zero-copy kernel path: data never crosses into userspace
+            offset = source.tell()
+            out_fd = destination.fileno()
+            try:
+                while True:
+                    sent = os.sendfile(out_fd, in_fd, offset, self.STREAMING_CHUNK_SIZE)
+                    if not sent:
+                        break
+                    offset += sent
+                    yield sent
+                source.seek(offset)
+                return
+            except OSError:
+                source.seek(offset)  # e.g. macOS (socket-only sendfile); finish with read/write
+        
+        while True:
+            chunk = source.read(self.STREAMING_CHUNK_SIZE)
+            if not chunk:
+                break
+            destination.write(chunk)
+            yield len(chunk)
+    
+    def _rmtree_blocking(self, path: Path) -> None:
+        """Remove a renamed-aside session tree (runs on the cleanup pool)"""
+        try:
+            shutil.rmtree(path)
+        except FileNotFoundError:
+            pass  # Already removed by an overlapping sweep
+        except OSError as e:
+            logger.warning(f"Failed to remove {path.name}: {str(e)}")
+    
+    def _reserve_space(self, f: IO[bytes], size: int) -> None:
+        """Preallocate disk blocks for a file about to be written; fails fast when the disk is full"""
+        if hasattr(os, "posix_fallocate"):
+            try:
+                os.posix_fallocate(f.fileno(), 0, size)
+            except OSError as e:
+                if e.errno == errno.ENOSPC:
+                    raise StorageQuotaExceededError(f"Insufficient disk space for {size} bytes")
+                # Filesystem without fallocate support; write without reservation
         
-        total_size = 0
-        for file_path in self.storage_root.rglob('*'):
-            if file_path.is_file():
-                total_size += file_path.stat().st_size
-        return total_size
+        if hasattr(os, "posix_fadvise"):
+            os.posix_fadvise(f.fileno(), 0, size, os.POSIX_FADV_SEQUENTIAL)
     
     def _estimate_stream_size(self, file_stream: IO[bytes]) -> int:
-        """Estimate size of stream (simplified)"""
-        # In real implementation, would peek at content-length header or buffer
-        return 0  # Return 0 for now - would need proper implementation
+        """Bytes remaining in a seekable stream (0 if the size can't be determined)"""
+        try:
+            position = file_stream.tell()
+            size = file_stream.seek(0, os.SEEK_END) - position
+            file_stream.seek(position)
+            return size
+        except (AttributeError, OSError, ValueError):
+            return 0
     
     def _resolve_file_path(self, session_id: str, file_path: str) -> Path:
         """Resolve relative file path to absolute path"""
         session_path = self._get_session_path(session_id)
         return session_path / "files" / file_path
     
+    def _acquire_path_lock(self, key: str) -> threading.Lock:
+        """Get (creating on demand) the in-process lock for a path"""
+        with self.session_lock:
+            lock = self._path_locks.get(key)
+            if lock is None:
+                lock = self._path_locks[key] = threading.Lock()
+            return lock
+    
+    @contextmanager
+    def _file_lock(self, lock_path: Path) -> Iterator[None]:
+        """Hold a per-file lock: in-process unless multi_process is enabled"""
+        if self.multi_process:
+            lock_path.parent.mkdir(parents=True, exist_ok=True)
+            with FileLock(str(lock_path), timeout=self.FILE_LOCK_TIMEOUT):
+                yield
+            return
+        
+        lock = self._acquire_path_lock(str(lock_path))
+        if not lock.acquire(timeout=self.FILE_LOCK_TIMEOUT):
+            raise FileLockTimeoutError(f"Timed out waiting for lock on {lock_path.name}")
+        try:
+            yield
+        finally:
+            lock.release()
+    
     def _get_lock_path(self, session_id: str, file_path: str) -> Path:
         """Get lock file path for given file"""
         session_path = self._get_session_path(session_id)
@@ -0,0 +1 @@
+# Shared utilities for ClinIPrompt Tutorial Assistant
@@ -0,0 +1,10 @@
+import os
+
+
+def fast_uuid4() -> str:
+    """Random RFC 4122 version 4 UUID string, without building a uuid.UUID"""
+    b = bytearray(os.urandom(16))
+    b[6] = (b[6] & 0x0F) | 0x40  # version 4
+    b[8] = (b[8] & 0x3F) | 0x80  # RFC 4122 variant
+    h = b.hex()
+    return f"{h[0:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:32]}"
@@ -0,0 +1,18 @@
+from datetime import datetime
+from typing import Tuple
+import time
+
+
+# Refresh the cached timestamp at most this often (seconds)
+TIMESTAMP_CACHE_TTL = 0.05
+
+_cached: Tuple[float, str] = (0.0, "")
+
+
+def now_iso() -> str:
+    """Current local time in ISO 8601 format, cached at sub-second granularity"""
+    global _cached
+    now = time.time()
+    if now - _cached[0] > TIMESTAMP_CACHE_TTL:
+        _cached = (now, datetime.fromtimestamp(now).isoformat())
+    return _cached[1]
@@ -0,0 +1,58 @@
+import asyncio
+
+import httpx
+import pytest
+import pytest_asyncio
+
+from tests.helpers import json_body
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "slow: long-running end-to-end workflow tests (deselect with -m 'not slow')")
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    """Session-scoped event loop; the shared HTTP client pool is bound to it"""
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+@pytest_asyncio.fixture(scope="session")
+async def http_client():
+    """Pooled HTTP client reused across every test so keep-alive connections persist"""
+    client = httpx.AsyncClient(
+        base_url="http://localhost:8000",
+        timeout=300.0,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+    )
+    yield client
+    await client.aclose()
+
+
+@pytest_asyncio.fixture
+async def fresh_session(http_client):
+    """New session for a test that mutates it; deleted afterwards to free the per-client slot"""
+    response = await http_client.post("/api/v1/sessions")
+    session_id = json_body(response)["session_id"]
+    yield session_id
+    await http_client.delete(f"/api/v1/sessions/{session_id}")
+
+
+@pytest_asyncio.fixture
+async def session_cleanup(http_client):
+    """List for a test to record the sessions it creates; each is deleted afterwards, even if the test fails"""
+    session_ids = []
+    yield session_ids
+    for session_id in session_ids:
+        await http_client.delete(f"/api/v1/sessions/{session_id}")
+
+
+@pytest_asyncio.fixture(scope="module")
+async def readonly_session(http_client):
+    """Session shared by the read-only tests of a module"""
+    response = await http_client.post("/api/v1/sessions")
+    session_id = json_body(response)["session_id"]
+    yield session_id
+    await http_client.delete(f"/api/v1/sessions/{session_id}")
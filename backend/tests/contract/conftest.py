@@ -0,0 +1,33 @@
+import httpx
+import pytest
+import pytest_asyncio
+
+from src.api.main import app
+from tests.helpers import json_body
+from src.services.session_manager import session_manager
+
+
+@pytest.fixture(scope="session", autouse=True)
+def storage_root(tmp_path_factory):
+    """Point session storage at a pytest-managed temp directory for the in-process app"""
+    root = tmp_path_factory.mktemp("storage")
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(session_manager, "storage_root", root)
+        yield root
+
+
+@pytest_asyncio.fixture(scope="session")
+async def http_client():
+    """Contract tests only check response shapes, so drive the app in-process instead of over TCP"""
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://localhost:8000")
+    yield client
+    await client.aclose()
+
+
+@pytest_asyncio.fixture
+async def uploaded_session(http_client, fresh_session):
+    """Fresh session with a small audio file uploaded, so it is ready for processing"""
+    files = {"audio_file": ("tutorial.mp3", b"ID3\x03\x00\x00\x00" + bytes(1024), "audio/mpeg")}
+    response = await http_client.post(f"/api/v1/sessions/{fresh_session}/audio", files=files)
+    assert json_body(response)["session_state"] == "AUDIO_UPLOADED"
+    return fresh_session
@@ -1,37 +1,34 @@
 import pytest
-import httpx
-import uuid
+
+from tests.helpers import json_body
+
+
+_FAKE_SESSION_ID = "00000000-0000-4000-8000-000000000000"  # valid shape, never issued
 
 
 class TestProcessStartContract:
     """Contract tests for POST /api/v1/sessions/{session_id}/process endpoint"""
 
     @pytest.mark.asyncio
-    async def test_start_processing_success(self):
+    async def test_start_processing_success(self, http_client, uploaded_session):
         """Test successful processing initiation"""
-        async with httpx.AsyncClient(base_url="http://localhost:8000") as client:
-            # Create session and upload audio
-            create_response = await client.post("/api/v1/sessions")
-            session_id = create_response.json()["session_id"]
-            
-            # Mock audio upload (would need actual implementation)
-            # For contract test, assume audio is uploaded
-            
-            # Start processing
-            response = await client.post(
-                f"/api/v1/sessions/{session_id}/process",
-                json={
-                    "summary_duration": 15,
-                    "focus_areas": ["Key Learning Points", "Clinical Applications"],
-                    "custom_prompts": {
-                        "system_instruction": "Focus on practical applications",
-                        "style_preferences": "conversational tone"
-                    }
+        session_id = uploaded_session
+        
+        # Start processing
+        response = await http_client.post(
+            f"/api/v1/sessions/{session_id}/process",
+            json={
+                "summary_duration": 15,
+                "focus_areas": ["Key Learning Points", "Clinical Applications"],
+                "custom_prompts": {
+                    "system_instruction": "Focus on practical applications",
+                    "style_preferences": "conversational tone"
                 }
-            )
+            }
+        )
             
         assert response.status_code == 202
-        data = response.json()
+        data = json_body(response)
         
         # Validate response structure
         assert "task_id" in data
@@ -44,110 +41,80 @@ class TestProcessStartContract:
         assert data["task_id"]  # Should not be empty
 
     @pytest.mark.asyncio
-    async def test_start_processing_minimal_request(self):
+    async def test_start_processing_minimal_request(self, http_client, uploaded_session):
         """Test processing with minimal required parameters"""
-        async with httpx.AsyncClient(base_url="http://localhost:8000") as client:
-            create_response = await client.post("/api/v1/sessions")
-            session_id = create_response.json()["session_id"]
-            
-            response = await client.post(
-                f"/api/v1/sessions/{session_id}/process",
-                json={"summary_duration": 20}
-            )
+        session_id = uploaded_session
+        
+        response = await http_client.post(
+            f"/api/v1/sessions/{session_id}/process",
+            json={"summary_duration": 20}
+        )
             
         assert response.status_code == 202
-        data = response.json()
+        data = json_body(response)
         assert "task_id" in data
 
     @pytest.mark.asyncio
-    async def test_start_processing_invalid_duration(self):
-        """Test processing with invalid duration"""
-        async with httpx.AsyncClient(base_url="http://localhost:8000") as client:
-            create_response = await client.post("/api/v1/sessions")
-            session_id = create_response.json()["session_id"]
-            
-            # Duration below minimum (10)
-            response = await client.post(
-                f"/api/v1/sessions/{session_id}/process",
-                json={"summary_duration": 5}
-            )
-            
-        assert response.status_code == 400
-        error_data = response.json()
-        assert "duration" in error_data["error"]["message"].lower()
+    @pytest.mark.parametrize("duration", [5, 35])  # below minimum (10), above maximum (30)
+    async def test_start_processing_invalid_duration(self, http_client, readonly_session, duration):
+        """Test processing with duration outside the allowed range"""
+        response = await http_client.post(
+            f"/api/v1/sessions/{readonly_session}/process",
+            json={"summary_duration": duration}
+        )
+            
+        assert response.status_code == 422
+        error_data = json_body(response)
+        assert error_data["detail"][0]["loc"][-1] == "summary_duration"
 
     @pytest.mark.asyncio
-    async def test_start_processing_duration_above_maximum(self):
-        """Test processing with duration above maximum"""
-        async with httpx.AsyncClient(base_url="http://localhost:8000") as client:
-            create_response = await client.post("/api/v1/sessions")
-            session_id = create_response.json()["session_id"]
-            
-            # Duration above maximum (30)
-            response = await client.post(
-                f"/api/v1/sessions/{session_id}/process",
-                json={"summary_duration": 35}
-            )
-            
-        assert response.status_code == 400
-        error_data = response.json()
-        assert "duration" in error_data["error"]["message"].lower()
-
-    @pytest.mark.asyncio
-    async def test_start_processing_session_not_ready(self):
+    async def test_start_processing_session_not_ready(self, http_client, readonly_session):
         """Test processing when session is not ready (no audio)"""
-        async with httpx.AsyncClient(base_url="http://localhost:8000") as client:
-            create_response = await client.post("/api/v1/sessions")
-            session_id = create_response.json()["session_id"]
-            
-            # Try to process without uploading audio
-            response = await client.post(
-                f"/api/v1/sessions/{session_id}/process",
-                json={"summary_duration": 15}
-            )
+        session_id = readonly_session
+        
+        # Try to process without uploading audio
+        response = await http_client.post(
+            f"/api/v1/sessions/{session_id}/process",
+            json={"summary_duration": 15}
+        )
             
         assert response.status_code == 409
-        error_data = response.json()
-        assert "not ready" in error_data["error"]["message"].lower()
+        error_data = json_body(response)
+        assert "not ready" in error_data["detail"].lower()
 
     @pytest.mark.asyncio
-    async def test_start_processing_already_processing(self):
+    async def test_start_processing_already_processing(self, http_client, uploaded_session):
         """Test starting processing when already in progress"""
-        async with httpx.AsyncClient(base_url="http://localhost:8000") as client:
-            create_response = await client.post("/api/v1/sessions")
-            session_id = create_response.json()["session_id"]
-            
-            # Mock session with audio and start first processing
-            # This would require session to be in AUDIO_UPLOADED state
-            
-            # First processing request
-            first_response = await client.post(
-                f"/api/v1/sessions/{session_id}/process",
-                json={"summary_duration": 15}
-            )
-            
-            # Second processing request while first is running
-            second_response = await client.post(
-                f"/api/v1/sessions/{session_id}/process",
-                json={"summary_duration": 20}
-            )
-            
+        session_id = uploaded_session
+        
+        # First processing request
+        first_response = await http_client.post(
+            f"/api/v1/sessions/{session_id}/process",
+            json={"summary_duration": 15}
+        )
+        assert first_response.status_code == 202
+        
+        # Second processing request while first is running
+        second_response = await http_client.post(
+            f"/api/v1/sessions/{session_id}/process",
+            json={"summary_duration": 20}
+        )
+        
         # Should prevent duplicate processing
         assert second_response.status_code == 409
-        error_data = second_response.json()
-        assert "already processing" in error_data["error"]["message"].lower()
+        error_data = json_body(second_response)
+        assert "current state: processing" in error_data["detail"].lower()
 
     @pytest.mark.asyncio
-    async def test_start_processing_invalid_session(self):
+    async def test_start_processing_invalid_session(self, http_client):
         """Test processing with non-existent session"""
-        fake_session_id = str(uuid.uuid4())
+        fake_session_id = _FAKE_SESSION_ID
         
-        async with httpx.AsyncClient(base_url="http://localhost:8000") as client:
-            response = await client.post(
-                f"/api/v1/sessions/{fake_session_id}/process",
-                json={"summary_duration": 15}
-            )
+        response = await http_client.post(
+            f"/api/v1/sessions/{fake_session_id}/process",
+            json={"summary_duration": 15}
+        )
             
         assert response.status_code == 404
-        error_data = response.json()
-        assert "not found" in error_data["error"]["message"].lower()
\ No newline at end of file
+        error_data = json_body(response)
+        assert "not found" in error_data["detail"].lower()
\ No newline at end of file
@@ -1,29 +1,32 @@
 import pytest
-import httpx
+import gzip
+import orjson
 from unittest.mock import patch
 
+from src.services.session_manager import session_manager
+from tests.helpers import json_body
+
 
 class TestSessionsPostContract:
     """Contract tests for POST /api/v1/sessions endpoint"""
 
     @pytest.mark.asyncio
-    async def test_create_session_success(self):
+    async def test_create_session_success(self, http_client):
         """Test successful session creation with valid request"""
-        async with httpx.AsyncClient(base_url="http://localhost:8000") as client:
-            response = await client.post(
-                "/api/v1/sessions",
-                json={
-                    "user_agent": "Mozilla/5.0 (Test Browser)",
-                    "preferences": {
-                        "preferred_voice": "professional_female",
-                        "summary_style": "conversational",
-                        "emphasis_areas": ["Key Learning Points"]
-                    }
+        response = await http_client.post(
+            "/api/v1/sessions",
+            json={
+                "user_agent": "Mozilla/5.0 (Test Browser)",
+                "preferences": {
+                    "preferred_voice": "professional_female",
+                    "summary_style": "conversational",
+                    "emphasis_areas": ["Key Learning Points"]
                 }
-            )
+            }
+        )
             
         assert response.status_code == 201
-        data = response.json()
+        data = json_body(response)
         
         # Validate response structure
         assert "session_id" in data
@@ -37,60 +40,64 @@ class TestSessionsPostContract:
         assert data["session_id"]  # Should not be empty
 
     @pytest.mark.asyncio 
-    async def test_create_session_minimal_request(self):
+    async def test_create_session_minimal_request(self, http_client):
         """Test session creation with minimal request body"""
-        async with httpx.AsyncClient(base_url="http://localhost:8000") as client:
-            response = await client.post("/api/v1/sessions", json={})
+        response = await http_client.post("/api/v1/sessions", json={})
             
         assert response.status_code == 201
-        data = response.json()
+        data = json_body(response)
         assert data["state"] == "INITIAL"
 
     @pytest.mark.asyncio
-    async def test_create_session_invalid_preferences(self):
+    async def test_create_session_invalid_preferences(self, http_client):
         """Test session creation with invalid preferences"""
-        async with httpx.AsyncClient(base_url="http://localhost:8000") as client:
-            response = await client.post(
-                "/api/v1/sessions",
-                json={
-                    "preferences": {
-                        "preferred_voice": "invalid_voice",
-                        "summary_style": "invalid_style"
-                    }
+        response = await http_client.post(
+            "/api/v1/sessions",
+            json={
+                "preferences": {
+                    "preferred_voice": "invalid_voice",
+                    "summary_style": "invalid_style"
                 }
-            )
+            }
+        )
             
-        assert response.status_code == 400
-        error_data = response.json()
-        assert "error" in error_data
-        assert "code" in error_data["error"]
-        assert "message" in error_data["error"]
+        assert response.status_code == 422
+        error_data = json_body(response)
+        assert "detail" in error_data
+        error_fields = {error["loc"][-1] for error in error_data["detail"]}
+        assert {"preferred_voice", "summary_style"} <= error_fields
 
     @pytest.mark.asyncio
-    async def test_create_session_rate_limit(self):
+    async def test_create_session_rate_limit(self, http_client):
         """Test session creation rate limiting (5 concurrent per IP)"""
-        # This test simulates exceeding the concurrent session limit
-        # In real implementation, would need to track IP addresses
-        
-        # Mock the rate limiting logic
-        with patch('src.api.sessions.check_session_limit') as mock_limit:
-            mock_limit.return_value = False  # Simulate limit exceeded
-            
-            async with httpx.AsyncClient(base_url="http://localhost:8000") as client:
-                response = await client.post("/api/v1/sessions")
+        # Simulate exceeding the concurrent session limit
+        with patch.object(session_manager, "MAX_CONCURRENT_SESSIONS", 0):
+            response = await http_client.post("/api/v1/sessions")
                 
             assert response.status_code == 429
-            error_data = response.json()
+            error_data = json_body(response)
             assert "Too many concurrent sessions" in error_data["error"]["message"]
 
     @pytest.mark.asyncio
-    async def test_create_session_malformed_json(self):
+    async def test_create_session_gzip_body(self, http_client):
+        """Test session creation with a gzip-encoded JSON body"""
+        body = orjson.dumps({"preferences": {"preferred_voice": "professional_male"}})
+        response = await http_client.post(
+            "/api/v1/sessions",
+            content=gzip.compress(body),
+            headers={"Content-Type": "application/json", "Content-Encoding": "gzip"}
+        )
+            
+        assert response.status_code == 201
+        assert json_body(response)["state"] == "INITIAL"
+
+    @pytest.mark.asyncio
+    async def test_create_session_malformed_json(self, http_client):
         """Test session creation with malformed JSON"""
-        async with httpx.AsyncClient(base_url="http://localhost:8000") as client:
-            response = await client.post(
-                "/api/v1/sessions",
-                content='{"invalid": json',
-                headers={"Content-Type": "application/json"}
-            )
+        response = await http_client.post(
+            "/api/v1/sessions",
+            content='{"invalid": json',
+            headers={"Content-Type": "application/json"}
+        )
             
         assert response.status_code == 422  # Unprocessable Entity for malformed JSON
\ No newline at end of file
@@ -0,0 +1,6 @@
+import orjson
+
+
+def json_body(response):
+    """Decode a response body with orjson (C parser) instead of httpx's stdlib json"""
+    return orjson.loads(response.content)
@@ -1,12 +1,137 @@
 import streamlit as st
 import requests
-import json
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from requests_toolbelt import MultipartEncoder
+from streamlit_autorefresh import st_autorefresh
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+import orjson
+import gzip
+import math
+import os
+import ssl
+import tempfile
+import time
+from urllib.parse import urlsplit, urlunsplit
 from datetime import datetime
 from typing import Optional, Dict, Any
 
 
 # Configuration
 API_BASE_URL = "http://localhost:8001/api/v1"
+PDF_UPLOAD_SHARDS = 3  # PDFs are split across this many concurrent upload requests
+# Status polling intervals: fast while progress is moving, slow once it stalls
+STATUS_POLL_FAST_MS = 1_000
+STATUS_POLL_SLOW_MS = 5_000
+PENDING_POLL_MS = 500  # Rerun interval while a background API call is in flight
+JSON_HEADERS = {"Content-Type": "application/json"}
+GZIP_JSON_HEADERS = {"Content-Type": "application/json", "Content-Encoding": "gzip"}
+GZIP_MIN_BYTES = 256  # Smaller JSON bodies are sent as-is; gzip framing would outweigh the savings
+MAX_AUDIO_SIZE = 30 * 1024 * 1024  # 30MB, matches the backend limit
+MAX_PDF_SIZE = 10 * 1024 * 1024  # 10MB per PDF
+MAX_PDF_FILES = 5
+MAX_WEB_LINKS = 10  # Matches the backend limit per request
+# (connect, read) timeouts in seconds; connect is just over a TCP retransmit window
+STATUS_TIMEOUT = (3.05, 10)  # Session, status and delete calls
+API_TIMEOUT = (3.05, 30)  # Session creation, web links and processing start
+UPLOAD_TIMEOUT = (3.05, 120)  # Audio and PDF uploads
+DOWNLOAD_TIMEOUT = (3.05, 300)  # Generated audio download
+DOWNLOAD_CHUNK_SIZE = 64 * 1024  # 64KB
+AUDIO_DOWNLOAD_ENABLED = False  # The backend has no /audio-download endpoint yet
+
+# Widget option lists, allocated once instead of on every rerun
+AUDIO_UPLOAD_TYPES = ('mp3', 'wav', 'm4a', 'mp4', 'ogg')
+PDF_UPLOAD_TYPES = ('pdf',)
+FOCUS_AREA_OPTIONS = ("Key Learning Points", "Clinical Applications", "Case Studies", "Evidence-Based Practice")
+VOICE_STYLE_OPTIONS = ("professional_female", "professional_male", "conversational_female", "conversational_male")
+SUMMARY_STYLE_OPTIONS = ("conversational", "technical", "basic")
+DEFAULT_FOCUS_AREAS = ("Key Learning Points",)
+
+# Upload help text, built once from the limits above
+AUDIO_UPLOAD_HELP = (
+    f"Maximum file size: {MAX_AUDIO_SIZE // (1024 * 1024)}MB. "
+    f"Supported formats: {', '.join(t.upper() for t in AUDIO_UPLOAD_TYPES)}"
+)
+PDF_UPLOAD_HELP = f"Maximum {MAX_PDF_FILES} PDFs, {MAX_PDF_SIZE // (1024 * 1024)}MB each"
+WEB_LINKS_HELP = f"Maximum {MAX_WEB_LINKS} URLs"
+
+
+@dataclass(slots=True)
+class UIState:
+    """Scalar fields the UI renders from; the full session JSON is kept separately under session_data"""
+    session_id: Optional[str] = None
+    state: str = "UNKNOWN"
+    status: str = ""  # Processing status: pending/processing/completed/error, empty until processing starts
+    progress: int = 0
+    current_step: str = ""
+    error: str = ""
+    etag: str = ""
+    status_etag: str = ""
+    next_status_poll: float = 0.0  # time.monotonic() deadline for the next polled status request
+    
+    def apply_session(self, data: Dict[str, Any], etag: str = "") -> None:
+        """Copy the displayed fields out of a session payload"""
+        self.state = data.get('state', 'UNKNOWN')
+        self.etag = etag
+        if data.get('processing_status'):
+            self.apply_status(data['processing_status'])
+    
+    def apply_status(self, status: Dict[str, Any]) -> bool:
+        """Copy the displayed fields out of a processing status payload; returns True if anything changed"""
+        fields = (
+            status.get('session_state', self.state),  # Only sent by the /status endpoint
+            status.get('status', ''),
+            status.get('progress', 0),
+            status.get('current_step', 'Processing...'),
+            status.get('error') or ''
+        )
+        if fields == (self.state, self.status, self.progress, self.current_step, self.error):
+            return False
+        self.state, self.status, self.progress, self.current_step, self.error = fields
+        return True
+
+
+class TLSAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools all share one SSLContext"""
+    
+    def __init__(self, ssl_context: ssl.SSLContext, **kwargs):
+        self.ssl_context = ssl_context  # Set first: HTTPAdapter.__init__ builds the pool manager
+        super().__init__(**kwargs)
+    
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["ssl_context"] = self.ssl_context
+        return super().init_poolmanager(*args, **kwargs)
+
+
+def _tls_context() -> ssl.SSLContext:
+    """Client TLS context built once, so CA certificates are not reloaded for every new connection"""
+    return ssl.create_default_context()
+
+
+@st.cache_resource
+def _api_session() -> requests.Session:
+    """HTTP session shared across reruns so pooled keep-alive connections stay warm"""
+    session = requests.Session()
+    # Retry transient gateway errors; urllib3 only retries idempotent methods, so uploads are never replayed
+    retries = Retry(total=3, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+    pool_options = {"pool_connections": 4, "pool_maxsize": 8, "max_retries": retries}
+    session.mount("http://", HTTPAdapter(**pool_options))
+    if API_BASE_URL.startswith("https://"):
+        session.mount("https://", TLSAdapter(_tls_context(), **pool_options))
+    return session
+
+
+@st.cache_resource
+def _upload_executor() -> ThreadPoolExecutor:
+    """Worker pool for concurrent upload requests: the PDF shards plus the web-links request"""
+    return ThreadPoolExecutor(max_workers=PDF_UPLOAD_SHARDS + 1, thread_name_prefix="upload")
+
+
+@st.cache_resource
+def _background_executor() -> ThreadPoolExecutor:
+    """Worker pool that keeps slow API calls off the Streamlit script thread"""
+    return ThreadPoolExecutor(max_workers=4, thread_name_prefix="api")
 
 
 def main():
@@ -22,12 +147,17 @@ def main():
     st.markdown("Transform clinical tutorial conversations into engaging podcast-style audio summaries")
     
     # Initialize session state
-    if 'session_id' not in st.session_state:
-        st.session_state.session_id = None
+    if 'ui' not in st.session_state:
+        st.session_state.ui = UIState()
     if 'session_data' not in st.session_state:
         st.session_state.session_data = None
-    if 'processing_status' not in st.session_state:
-        st.session_state.processing_status = None
+    if 'pending' not in st.session_state:
+        st.session_state.pending = None
+    if 'retry' not in st.session_state:
+        st.session_state.retry = None
+    
+    check_pending_request()
+    show_retry()
     
     # Sidebar for session management
     with st.sidebar:
@@ -38,8 +168,8 @@ def main():
             create_new_session()
         
         # Show current session info
-        if st.session_state.session_id:
-            st.success(f"Session ID: {st.session_state.session_id[:8]}...")
+        if st.session_state.ui.session_id:
+            st.success(f"Session ID: {st.session_state.ui.session_id[:8]}...")
             if st.button("🔄 Refresh Session"):
                 refresh_session()
             if st.button("🗑️ End Session"):
@@ -48,15 +178,16 @@ def main():
             st.info("No active session")
     
     # Main content area
-    if st.session_state.session_id:
+    if st.session_state.ui.session_id:
         show_main_workflow()
     else:
         show_welcome_screen()
 
 
-def show_welcome_screen():
-    """Show welcome screen when no session is active"""
-    st.markdown("""
+@st.cache_data(show_spinner=False)
+def _welcome_md() -> str:
+    """Static welcome-screen markdown, built once per server process"""
+    return """
     ## Welcome to ClinIPrompt Tutorial Assistant
     
     This tool helps you create engaging podcast-style summaries from clinical tutorial conversations.
@@ -79,21 +210,26 @@ def show_welcome_screen():
     - Audio files up to 30MB
     - Supported formats: MP3, WAV, M4A, MP4
     - Clear speech content for best results
-    """)
+    """
+
+
+def show_welcome_screen():
+    """Show welcome screen when no session is active"""
+    st.markdown(_welcome_md())
 
 
 def show_main_workflow():
     """Show main workflow interface"""
-    if not st.session_state.session_data:
+    ui = st.session_state.ui
+    if ui.state == "UNKNOWN":
         refresh_session()
     
-    session_data = st.session_state.session_data
-    if not session_data:
+    if ui.state == "UNKNOWN":
         st.error("Failed to load session data")
         return
     
     # Show current session state
-    state = session_data.get('state', 'UNKNOWN')
+    state = ui.state
     st.info(f"Session State: **{state}**")
     
     # Step 1: Audio Upload
@@ -102,8 +238,8 @@ def show_main_workflow():
     if state == "INITIAL":
         audio_file = st.file_uploader(
             "Upload clinical tutorial audio",
-            type=['mp3', 'wav', 'm4a', 'mp4', 'ogg'],
-            help="Maximum file size: 30MB. Supported formats: MP3, WAV, M4A, MP4, OGG"
+            type=AUDIO_UPLOAD_TYPES,
+            help=AUDIO_UPLOAD_HELP
         )
         
         if audio_file is not None:
@@ -123,86 +259,82 @@ def show_main_workflow():
                 st.subheader("PDF Documents")
                 pdf_files = st.file_uploader(
                     "Upload PDF documents",
-                    type=['pdf'],
+                    type=PDF_UPLOAD_TYPES,
                     accept_multiple_files=True,
-                    help="Maximum 5 PDFs, 10MB each"
+                    help=PDF_UPLOAD_HELP
                 )
-                
-                if pdf_files and st.button("📤 Upload PDFs"):
-                    upload_pdf_files(pdf_files)
             
             with col2:
                 st.subheader("Web References")
                 web_links = st.text_area(
                     "Enter reference URLs (one per line)",
-                    help="Maximum 10 URLs"
+                    help=WEB_LINKS_HELP
                 )
-                
-                if web_links.strip() and st.button("🌐 Add Web Links"):
-                    urls = [url.strip() for url in web_links.split('\n') if url.strip()]
-                    add_web_links(urls)
+            
+            # PDFs and links go out together so the waits overlap instead of adding up
+            if (pdf_files or web_links.strip()) and st.button("📤 Submit Supplementary Content"):
+                urls, rejected = normalize_urls(web_links.splitlines())
+                # Nothing is dropped silently: point out the offending lines and let the user fix them
+                if rejected:
+                    st.warning(f"Not valid http(s) URLs: {', '.join(rejected)}")
+                elif len(urls) > MAX_WEB_LINKS:
+                    st.warning(f"At most {MAX_WEB_LINKS} unique URLs can be added ({len(urls)} given)")
+                else:
+                    submit_supplementary_content(pdf_files or [], urls)
         
         # Step 3: Processing Configuration
         if state in ["AUDIO_UPLOADED", "CONTENT_ADDED"]:
             st.header("⚙️ Step 3: Configure Processing")
             
-            col1, col2 = st.columns(2)
-            
-            with col1:
-                duration = st.slider(
-                    "Summary Duration (minutes)",
-                    min_value=10,
-                    max_value=30,
-                    value=20,
-                    help="Desired length of the final summary"
-                )
+            # Widgets inside a form don't rerun the script on every change, only on submit
+            with st.form("processing_config"):
+                col1, col2 = st.columns(2)
                 
-                focus_areas = st.multiselect(
-                    "Focus Areas",
-                    ["Key Learning Points", "Clinical Applications", "Case Studies", "Evidence-Based Practice"],
-                    default=["Key Learning Points"],
-                    help="Areas to emphasize in the summary"
-                )
-            
-            with col2:
-                voice_style = st.selectbox(
-                    "Voice Style",
-                    ["professional_female", "professional_male", "conversational_female", "conversational_male"],
-                    help="Voice style for the generated audio"
-                )
+                with col1:
+                    duration = st.slider(
+                        "Summary Duration (minutes)",
+                        min_value=10,
+                        max_value=30,
+                        value=20,
+                        help="Desired length of the final summary"
+                    )
+                    
+                    focus_areas = st.multiselect(
+                        "Focus Areas",
+                        FOCUS_AREA_OPTIONS,
+                        default=DEFAULT_FOCUS_AREAS,
+                        help="Areas to emphasize in the summary"
+                    )
+                
+                with col2:
+                    voice_style = st.selectbox(
+                        "Voice Style",
+                        VOICE_STYLE_OPTIONS,
+                        help="Voice style for the generated audio"
+                    )
+                    
+                    summary_style = st.selectbox(
+                        "Summary Style",
+                        SUMMARY_STYLE_OPTIONS,
+                        help="Overall style of the summary content"
+                    )
                 
-                summary_style = st.selectbox(
-                    "Summary Style",
-                    ["conversational", "technical", "basic"],
-                    help="Overall style of the summary content"
+                custom_instruction = st.text_area(
+                    "Custom Instructions (Optional)",
+                    help="Additional instructions for content generation"
                 )
+                
+                submitted = st.form_submit_button("🚀 Start Processing", type="primary")
             
-            custom_instruction = st.text_area(
-                "Custom Instructions (Optional)",
-                help="Additional instructions for content generation"
-            )
-            
-            if st.button("🚀 Start Processing", type="primary"):
+            if submitted:
                 start_processing(duration, focus_areas, voice_style, summary_style, custom_instruction)
         
         # Step 4: Processing Status
         if state == "PROCESSING":
             st.header("⏳ Processing Your Tutorial")
             
-            # Auto-refresh processing status
-            if st.button("🔄 Refresh Status"):
-                check_processing_status()
-            
-            if st.session_state.processing_status:
-                status = st.session_state.processing_status
-                progress = status.get('progress', 0)
-                current_step = status.get('current_step', 'Processing...')
-                
-                st.progress(progress / 100.0)
-                st.info(f"Status: {current_step} ({progress}%)")
-                
-                if status.get('status') == 'error':
-                    st.error(f"Processing failed: {status.get('error', 'Unknown error')}")
+            # Progress is redrawn inside a fragment, so status updates don't rerun the rest of the page
+            processing_panel()
         
         # Step 5: Results
         if state == "COMPLETED":
@@ -215,156 +347,392 @@ def show_main_workflow():
                     show_summary_script()
             
             with col2:
-                if st.button("🎵 Download Audio"):
+                if not AUDIO_DOWNLOAD_ENABLED:
+                    st.caption("Audio download is not available yet")
+                elif st.button("🎵 Download Audio"):
                     download_audio()
 
 
-def create_new_session():
-    """Create a new session"""
+def _expect(response, expected, action):
+    """Return True if response has the expected status, otherwise report it and return False"""
+    if response.status_code == expected:
+        return True
+    st.error(f"Failed to {action}: {response.text}")
+    return False
+
+
+def timed_out(message, retry=None):
+    """Report a timed-out call; with a retry callable, offer a retry button from the next rerun on"""
+    if retry is None:
+        st.warning(message)
+        return
+    st.session_state.retry = (message, retry)
+    st.rerun()
+
+
+def show_retry():
+    """Render the retry button for the last timed-out call, if any"""
+    if st.session_state.retry is None:
+        return
+    
+    message, retry = st.session_state.retry
+    st.warning(f"{message}. The server may still be busy.")
+    if st.button("🔁 Retry", key="retry"):
+        st.session_state.retry = None
+        retry()
+
+
+def encode_json(payload):
+    """Serialize a JSON request body, gzipping it when large enough to be worth it; returns (body, headers)"""
+    body = orjson.dumps(payload)
+    if len(body) < GZIP_MIN_BYTES:
+        return body, JSON_HEADERS
+    # Level 1 is several times faster than the default and keeps most of the savings on JSON
+    return gzip.compress(body, compresslevel=1), GZIP_JSON_HEADERS
+
+
+def _call(method, path, expected, action, retry=None, json=None, **kwargs) -> Optional[requests.Response]:
+    """Send an API request and return the response, or None after reporting a failure
+    
+    json payloads are encoded with encode_json. 304 is passed through untouched since the
+    server only sends it to conditional requests.
+    """
+    if json is not None:
+        kwargs["data"], kwargs["headers"] = encode_json(json)
+    kwargs.setdefault("timeout", API_TIMEOUT)
     try:
-        response = requests.post(f"{API_BASE_URL}/sessions")
-        if response.status_code == 201:
-            data = response.json()
-            st.session_state.session_id = data['session_id']
-            st.session_state.session_data = data
-            st.success("New session created successfully!")
-            st.rerun()
-        else:
-            st.error(f"Failed to create session: {response.text}")
+        response = _api_session().request(method, f"{API_BASE_URL}{path}", **kwargs)
+    except requests.Timeout:
+        timed_out(f"Timed out trying to {action}", retry)
+        return None
     except requests.RequestException as e:
         st.error(f"Network error: {str(e)}")
+        return None
+    if response.status_code == 304 or _expect(response, expected, action):
+        return response
+    return None
+
+
+def create_new_session():
+    """Create a new session"""
+    response = _call("POST", "/sessions", 201, "create session", retry=create_new_session)
+    if response is None:
+        return
+    
+    data = orjson.loads(response.content)
+    st.session_state.ui = UIState(session_id=data['session_id'])
+    st.session_state.ui.apply_session(data)
+    st.session_state.session_data = data
+    st.success("New session created successfully!")
+    st.rerun()
 
 
 def refresh_session():
     """Refresh current session data"""
-    if not st.session_state.session_id:
+    ui = st.session_state.ui
+    if not ui.session_id:
         return
     
-    try:
-        response = requests.get(f"{API_BASE_URL}/sessions/{st.session_state.session_id}")
-        if response.status_code == 200:
-            st.session_state.session_data = response.json()
-        else:
-            st.error(f"Failed to refresh session: {response.text}")
-    except requests.RequestException as e:
-        st.error(f"Network error: {str(e)}")
+    response = _call(
+        "GET", f"/sessions/{ui.session_id}", 200, "refresh session",
+        headers={"If-None-Match": ui.etag},
+        timeout=STATUS_TIMEOUT
+    )
+    if response is None or response.status_code == 304:
+        return  # Failed, or unchanged since the last fetch
+    
+    data = orjson.loads(response.content)
+    ui.apply_session(data, response.headers.get("ETag", ""))
+    st.session_state.session_data = data
 
 
 def end_session():
     """End current session"""
-    if not st.session_state.session_id:
+    if not st.session_state.ui.session_id:
+        return
+    
+    response = _call(
+        "DELETE", f"/sessions/{st.session_state.ui.session_id}", 204, "end session",
+        retry=end_session,
+        timeout=STATUS_TIMEOUT
+    )
+    if response is None:
+        return
+    
+    st.session_state.ui = UIState()
+    st.session_state.session_data = None
+    st.success("Session ended successfully!")
+    st.rerun()
+
+
+def multipart_body(fields):
+    """Build a streaming multipart body so uploads are read from the file instead of copied into memory"""
+    encoder = MultipartEncoder(fields=fields)
+    return encoder, {"Content-Type": encoder.content_type}
+
+
+def _pdf_shard_request(session, url, pdfs):
+    """Build a zero-argument POST for one PDF shard; the multipart body is rebuilt per call so it can be resent"""
+    def send():
+        for pdf in pdfs:
+            pdf.seek(0)
+        body, headers = multipart_body([("pdf_files", (pdf.name, pdf, pdf.type)) for pdf in pdfs])
+        return session.post(url, data=body, headers=headers, timeout=UPLOAD_TIMEOUT)
+    return send
+
+
+def request_in_flight():
+    """Warn and return True if a background API call is still running"""
+    pending = st.session_state.pending
+    if pending and not pending[1].done():
+        st.warning(f"Please wait: {pending[0].lower()} is still in progress")
+        return True
+    return False
+
+
+def run_in_background(label, call, on_result, retry=None):
+    """Run a blocking API call on the background pool; on_result gets its return value on a later rerun
+    
+    retry, if given, re-issues the whole action when the call times out.
+    """
+    if request_in_flight():
         return
     
+    st.session_state.pending = (label, _background_executor().submit(call), on_result, retry)
+    st.rerun()
+
+
+def check_pending_request():
+    """Hand a finished background call to its result handler, or keep polling while it runs"""
+    pending = st.session_state.pending
+    if not pending:
+        return
+    
+    label, future, on_result, retry = pending
+    if not future.done():
+        st.sidebar.info(f"⏳ {label}...")
+        st_autorefresh(interval=PENDING_POLL_MS, key="pending_poll")
+        return
+    
+    st.session_state.pending = None
     try:
-        response = requests.delete(f"{API_BASE_URL}/sessions/{st.session_state.session_id}")
-        if response.status_code == 204:
-            st.session_state.session_id = None
-            st.session_state.session_data = None
-            st.session_state.processing_status = None
-            st.success("Session ended successfully!")
-            st.rerun()
-        else:
-            st.error(f"Failed to end session: {response.text}")
+        on_result(future.result())
+    except requests.Timeout:
+        timed_out(f"{label} timed out", retry)
     except requests.RequestException as e:
         st.error(f"Network error: {str(e)}")
 
 
 def upload_audio_file(audio_file):
-    """Upload audio file"""
-    try:
-        files = {"audio_file": (audio_file.name, audio_file.getvalue(), audio_file.type)}
-        response = requests.post(
-            f"{API_BASE_URL}/sessions/{st.session_state.session_id}/audio",
-            files=files
-        )
-        
-        if response.status_code == 201:
-            st.success("Audio file uploaded successfully!")
-            refresh_session()
-            st.rerun()
-        else:
-            st.error(f"Failed to upload audio: {response.text}")
-    except requests.RequestException as e:
-        st.error(f"Network error: {str(e)}")
+    """Upload audio file in the background"""
+    # Reject oversized files before reading or sending any bytes
+    if audio_file.size > MAX_AUDIO_SIZE:
+        st.error("File exceeds 30MB limit")
+        return
+    
+    session = _api_session()
+    url = f"{API_BASE_URL}/sessions/{st.session_state.ui.session_id}/audio"
+    audio_file.seek(0)
+    body, headers = multipart_body({"audio_file": (audio_file.name, audio_file, audio_file.type)})
+    run_in_background(
+        "Uploading audio",
+        lambda: session.post(url, data=body, headers=headers, timeout=UPLOAD_TIMEOUT),
+        _audio_uploaded,
+        retry=lambda: upload_audio_file(audio_file)
+    )
 
 
-def upload_pdf_files(pdf_files):
-    """Upload PDF files"""
-    try:
-        files = [("pdf_files", (pdf.name, pdf.getvalue(), pdf.type)) for pdf in pdf_files]
-        response = requests.post(
-            f"{API_BASE_URL}/sessions/{st.session_state.session_id}/pdfs",
-            files=files
-        )
-        
-        if response.status_code == 201:
-            st.success("PDF files uploaded successfully!")
-            refresh_session()
-        else:
-            st.error(f"Failed to upload PDFs: {response.text}")
-    except requests.RequestException as e:
-        st.error(f"Network error: {str(e)}")
+def _audio_uploaded(response):
+    if _expect(response, 201, "upload audio"):
+        st.success("Audio file uploaded successfully!")
+        refresh_session()
+        st.rerun()
 
 
-def add_web_links(urls):
-    """Add web reference links"""
-    try:
-        data = {"urls": urls}
-        response = requests.post(
-            f"{API_BASE_URL}/sessions/{st.session_state.session_id}/web-links",
-            json=data
+def normalize_urls(lines):
+    """Canonicalise http(s) URLs and drop duplicates; returns (urls, lines that are not valid http(s) URLs)"""
+    urls = []
+    rejected = []
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            parts = urlsplit(line)
+            parts.port  # Validates the port; like urlsplit itself, raises ValueError on malformed input
+        except ValueError:
+            rejected.append(line)
+            continue
+        if parts.scheme.lower() not in ("http", "https") or not parts.netloc:
+            rejected.append(line)
+            continue
+        urls.append(urlunsplit((
+            parts.scheme.lower(),
+            parts.netloc.lower(),
+            parts.path.rstrip('/') or '/',
+            parts.query,
+            ''  # Fragments never reach the server, so they don't distinguish links
+        )))
+    return list(dict.fromkeys(urls)), rejected
+
+
+def submit_supplementary_content(pdf_files, urls):
+    """Upload PDFs and add web links in the background, with all requests in flight at once
+    
+    PDFs are sharded across concurrent requests; the web-links request runs alongside them.
+    """
+    if len(pdf_files) > MAX_PDF_FILES:
+        st.error(f"At most {MAX_PDF_FILES} PDFs can be uploaded")
+        return
+    oversized = [pdf.name for pdf in pdf_files if pdf.size > MAX_PDF_SIZE]
+    if oversized:
+        st.error(f"PDFs exceed 10MB limit: {', '.join(oversized)}")
+        return
+    
+    session = _api_session()
+    session_url = f"{API_BASE_URL}/sessions/{st.session_state.ui.session_id}"
+    parts = []
+    if pdf_files:
+        shard_size = math.ceil(len(pdf_files) / PDF_UPLOAD_SHARDS)
+        for i in range(0, len(pdf_files), shard_size):
+            shard = pdf_files[i:i + shard_size]
+            parts.append((
+                f"PDFs {', '.join(pdf.name for pdf in shard)}",
+                _pdf_shard_request(session, f"{session_url}/pdfs", shard)
+            ))
+    if urls:
+        body, headers = encode_json({"urls": urls})
+        parts.append((
+            "web links",
+            lambda: session.post(f"{session_url}/web-links", data=body, headers=headers, timeout=API_TIMEOUT)
+        ))
+    
+    send_supplementary_parts(parts)
+
+
+def send_supplementary_parts(parts):
+    """Send (label, request) parts concurrently in the background; a retry passes only the parts that timed out"""
+    run_in_background(
+        "Adding supplementary content",
+        lambda: _gather_parts(parts),
+        _supplementary_content_added
+    )
+
+
+def _gather_parts(parts):
+    """Run each part on the upload pool; returns (label, request, response or exception) for every part"""
+    futures = [(label, send, _upload_executor().submit(send)) for label, send in parts]
+    outcomes = []
+    for label, send, future in futures:
+        try:
+            outcomes.append((label, send, future.result()))
+        except requests.RequestException as e:
+            outcomes.append((label, send, e))
+    return outcomes
+
+
+def _supplementary_content_added(outcomes):
+    failed = [
+        (label, send, outcome) for label, send, outcome in outcomes
+        if isinstance(outcome, Exception) or outcome.status_code != 201
+    ]
+    if len(failed) < len(outcomes):
+        refresh_session()  # Show what was added even when other parts failed
+    if not failed:
+        st.success("Supplementary content added successfully!")
+        return
+    
+    for label, _, outcome in failed:
+        reason = str(outcome) if isinstance(outcome, Exception) else outcome.text
+        st.error(f"Failed to add {label}: {reason}")
+    
+    # Parts that already returned 201 are never resent, so a retry can't add them twice
+    timed_out_parts = [(label, send) for label, send, outcome in failed if isinstance(outcome, requests.Timeout)]
+    if timed_out_parts:
+        st.session_state.retry = (
+            f"Adding {', '.join(label for label, _ in timed_out_parts)} timed out",
+            lambda: send_supplementary_parts(timed_out_parts)
         )
-        
-        if response.status_code == 201:
-            st.success("Web links added successfully!")
-            refresh_session()
-        else:
-            st.error(f"Failed to add web links: {response.text}")
-    except requests.RequestException as e:
-        st.error(f"Network error: {str(e)}")
 
 
 def start_processing(duration, focus_areas, voice_style, summary_style, custom_instruction):
-    """Start processing the tutorial"""
-    try:
-        data = {
-            "summary_duration": duration,
-            "focus_areas": focus_areas,
-            "voice_style": voice_style,
-            "summary_style": summary_style
+    """Start processing the tutorial in the background"""
+    data = {
+        "summary_duration": duration,
+        "focus_areas": focus_areas,
+        "voice_style": voice_style,
+        "summary_style": summary_style
+    }
+    
+    if custom_instruction.strip():
+        data["custom_prompts"] = {
+            "system_instruction": custom_instruction.strip()
         }
-        
-        if custom_instruction.strip():
-            data["custom_prompts"] = {
-                "system_instruction": custom_instruction.strip()
-            }
-        
-        response = requests.post(
-            f"{API_BASE_URL}/sessions/{st.session_state.session_id}/process",
-            json=data
-        )
-        
-        if response.status_code == 202:
-            st.success("Processing started successfully!")
-            refresh_session()
-            st.rerun()
-        else:
-            st.error(f"Failed to start processing: {response.text}")
-    except requests.RequestException as e:
-        st.error(f"Network error: {str(e)}")
+    
+    body, headers = encode_json(data)
+    session = _api_session()
+    url = f"{API_BASE_URL}/sessions/{st.session_state.ui.session_id}/process"
+    run_in_background(
+        "Starting processing",
+        lambda: session.post(url, data=body, headers=headers, timeout=API_TIMEOUT),
+        _processing_started,
+        retry=lambda: start_processing(duration, focus_areas, voice_style, summary_style, custom_instruction)
+    )
+
+
+def _processing_started(response):
+    if _expect(response, 202, "start processing"):
+        st.success("Processing started successfully!")
+        refresh_session()
+        st.rerun()
 
 
 def check_processing_status():
-    """Check processing status"""
-    try:
-        response = requests.get(f"{API_BASE_URL}/sessions/{st.session_state.session_id}/status")
-        if response.status_code == 200:
-            st.session_state.processing_status = response.json()
-            refresh_session()
-        else:
-            st.error(f"Failed to check status: {response.text}")
-    except requests.RequestException as e:
-        st.error(f"Network error: {str(e)}")
+    """Check processing status; returns True if it changed since the last check"""
+    ui = st.session_state.ui
+    response = _call(
+        "GET", f"/sessions/{ui.session_id}/status", 200, "check status",
+        headers={"If-None-Match": ui.status_etag},
+        timeout=STATUS_TIMEOUT
+    )
+    if response is None or response.status_code == 304:
+        return False  # Failed, or status unchanged so the session is too
+    
+    previous_state = ui.state
+    changed = ui.apply_status(orjson.loads(response.content))
+    ui.status_etag = response.headers.get("ETag", "")
+    if ui.state != previous_state:
+        refresh_session()  # The status carries the workflow state; only fetch the full session once it moves on
+    return changed
+
+
+def show_processing_status(placeholder, ui):
+    """Render processing progress from the UI state into placeholder"""
+    with placeholder.container():
+        st.progress(ui.progress / 100.0)
+        st.info(f"Status: {ui.current_step} ({ui.progress}%)")
+        
+        if ui.status == 'error':
+            st.error(f"Processing failed: {ui.error or 'Unknown error'}")
+
+
+@st.fragment(run_every=STATUS_POLL_FAST_MS / 1000)
+def processing_panel():
+    """Progress block polled on a timer, rerunning on its own rather than with the page
+    
+    The fragment ticks at the fast interval, but only requests status when the adaptive backoff allows it.
+    Each tick is one bounded conditional GET, so the script thread is never held open waiting on the server.
+    """
+    ui = st.session_state.ui
+    now = time.monotonic()
+    if ui.status not in ("completed", "error") and now >= ui.next_status_poll:
+        changed = check_processing_status()
+        ui.next_status_poll = now + (STATUS_POLL_FAST_MS if changed else STATUS_POLL_SLOW_MS) / 1000
+    
+    if ui.status:
+        show_processing_status(st.empty(), ui)
+    if ui.state != "PROCESSING":
+        st.rerun()  # The workflow moved on; redraw the whole page
 
 
 def show_summary_script():
@@ -373,8 +741,27 @@ def show_summary_script():
 
 
 def download_audio():
-    """Download the generated audio"""
-    st.info("Audio download not yet implemented - requires backend processing completion")
+    """Download the generated audio, spooling it through a temp file instead of buffering the response"""
+    response = _call(
+        "GET", f"/sessions/{st.session_state.ui.session_id}/audio-download", 200, "download audio",
+        retry=download_audio,
+        stream=True,
+        timeout=DOWNLOAD_TIMEOUT
+    )
+    if response is None:
+        return
+    
+    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".mp3")
+    try:
+        with response, tmp:
+            for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_SIZE):
+                tmp.write(chunk)
+        with open(tmp.name, "rb") as audio:
+            st.download_button("💾 Save Audio", data=audio, file_name="summary.mp3", mime="audio/mpeg")
+    except requests.RequestException as e:
+        st.error(f"Network error: {str(e)}")
+    finally:
+        os.unlink(tmp.name)
 
 
 if __name__ == "__main__":